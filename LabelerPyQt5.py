@@ -5,9 +5,10 @@
 
 import sys
 import os
-from typing import Dict, Any
+import re
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from functools import partial
-import label2yolo
 
 from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QWidget, QVBoxLayout, QPushButton, QHBoxLayout, \
     QSizePolicy, QFileDialog, QLineEdit, QSpinBox, QDoubleSpinBox, QStackedWidget, QGroupBox, QMessageBox
@@ -16,33 +17,84 @@ from PyQt5.QtCore import Qt, QTimer
 
 import Utils
 import ui_components
-from controllers import FrameController
+from controllers import FrameController, ConfigLoader, ConfigSaver, ModelLoader, PredictionBatcher, ConvertWorker, FrameSaveWorker
 import styles
 import cv2
+import numpy as np
 
 from annotate_canvas import AnnotateCanvas
+from frame_cache import FramePixmapCache, FrameDecodeTask, FrameDecodeSignals, decode_pool
 from auto_annotator import AutoAnnotator
-from label2yolo import Labelme2Yolo
-from training_panel import TrainingPanel
+
+if TYPE_CHECKING:
+    # 训练面板依赖较重，运行时在首次打开时才导入
+    from training_panel import TrainingPanel
+
+# 标准化路径时合并连续的斜杠
+_REPEATED_SLASHES = re.compile(r"/{2,}")
+
+# Qt 5.14 起支持 BGR888，可直接包装 OpenCV 数组；更早的版本按 RGB888 包装后交换通道
+_HAS_BGR888 = hasattr(QImage, "Format_BGR888")
+
+# YOLO标注行格式：class_id center_x center_y width height
+_YOLO_LINE_FORMAT = "0 %.6f %.6f %.6f %.6f\n"
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        try:
-            self.config = Utils.load_config()
-            self.frame_controller = FrameController()
-            
-            # 初始化自动标注器
-            self.auto_annotator = AutoAnnotator(self.config.get("model_path", ""))
-            self._last_model_path = self.config.get("model_path", "")
-        except Exception as e:
-            print(f"初始化主窗口时出错: {e}")
-            # 使用默认配置
-            self.config = {"video_path": "", "output_dir": "./output", "model_path": ""}
-            self.frame_controller = FrameController()
-            self.auto_annotator = AutoAnnotator("")
-            self._last_model_path = ""
+        # 先用默认配置构建界面，配置文件在后台线程读取，完成后由 _on_config_loaded 刷新控件
+        self.config = Utils.DEFAULT_CONFIG.copy()
+        self.frame_controller = FrameController(self.config)
+        self.auto_annotator = AutoAnnotator("")
+        self._last_model_path = ""
+        self._last_model_mtime = None  # 最近一次加载时模型文件的修改时间，文件被覆盖时重新加载
+        # 模型在后台线程加载，加载完成前自动标注不可用；只采用最近一次请求的结果
+        self._model_loaders = []
+
+        # 帧图像LRU缓存，来回翻页时不必重复解码JPEG
+        self.pixmap_cache = FramePixmapCache(max_bytes=256 * 1024 * 1024)
+        # 后台解码：代次号用于丢弃过期的解码结果
+        self._decode_generation = 0
+        self._current_frame_path = None
+        self._frame_mat_path = None  # current_frame_mat 解码自哪个文件，视频预览帧为 None
+        self._output_name_cache = ("", "")  # (输入路径, 输出文件夹名)
+        self._current_preview_index = None  # 视频预览模式下当前帧的帧号
+        self._last_frame_info = None  # 上次显示的 (文件夹模式, 帧号, 总数)
+        self._pending_frame_data = None  # 等待显示的最新帧（路径或数组）
+        # 选择视频/目录共用的文件对话框，首次使用时创建
+        self._file_dialog = None
+        # 最近一次翻页方向：1 向后，-1 向前，0 尚未翻页，用于决定预读哪一侧的帧
+        self._nav_direction = 0
+        # 同方向连续翻页的次数，连续越久预读越远
+        self._nav_streak = 0
+        self._decode_signals = FrameDecodeSignals()
+        self._decode_signals.decoded.connect(self._apply_decoded_image)
+        self._refresh_signals = FrameDecodeSignals()
+        self._refresh_signals.decoded.connect(self._apply_refreshed_image)
+        # 自动标注在批处理线程中进行（首次使用时创建），结果按帧缓存，切换面板或回到看过的帧无需重新推理
+        self.prediction_batcher = None
+        self._convert_worker = None
+        self._save_worker = None  # 标注保存线程，首次保存时创建
+        self._frame_count_cache = {}  # (视频路径, 修改时间) -> 总帧数
+        self._video_path_display_key = None  # 输出目录标签当前显示内容对应的 (视频路径, 输出目录)
+        self._prediction_cache = OrderedDict()
+        self._prediction_key = None
+        self._shown_prediction_key = None  # 画布上已载入的预测结果，新帧到来时清空
+        self._predicting_keys = set()  # 已提交批处理、结果尚未返回的帧
+        # 预测开启时预读后续帧的原图数组并提前检测，结果与当前帧一样进入预测缓存
+        self._lookahead_signals = FrameDecodeSignals()
+        self._lookahead_signals.decoded.connect(self._on_lookahead_decoded)
+        self._redecode_timer = QTimer(self)
+        self._redecode_timer.setSingleShot(True)
+        self._redecode_timer.timeout.connect(self._redecode_current_frame)
+        # 配置写盘防抖：连续修改只在停止500ms后写一次
+        self._config_dirty_timer = QTimer(self)
+        self._config_dirty_timer.setSingleShot(True)
+        self._config_dirty_timer.setInterval(500)
+        self._config_dirty_timer.timeout.connect(self._flush_config)
+        self._mark_config_dirty = self._config_dirty_timer.start
+        self._config_saver = None
 
         # ====== UI组件引用 ======
         self.image_label: QLabel = None
@@ -60,7 +112,8 @@ class MainWindow(QMainWindow):
         self.output_dir_line_edit: QLineEdit = None
         self.settings_btn: QPushButton = None
         self.output_browse_btn: QPushButton = None
-        self.current_preview_image = None  # 防止 QImage 被 GC
+        self.training_panel: Optional["TrainingPanel"] = None
+        self.settings_panel: QWidget = None
         self.current_frame_mat = None  # 缓存当前帧的numpy数组
 
         # ====== 窗口设置 ======
@@ -79,53 +132,92 @@ class MainWindow(QMainWindow):
         self.create_top_button_bar(main_layout)
         self.create_middle_area(main_layout)
 
-        # 初始化帧文件列表
-        self.frame_controller.refresh_frame_files()
-        self.frame_controller.frame_loaded.connect(self.on_frame_loaded)
+        # 排队连接：连续到达的帧在事件循环中合并，只显示最新一帧
+        self.frame_controller.frame_loaded.connect(self._queue_loaded_frame, Qt.QueuedConnection)
         self.frame_controller.extraction_finished.connect(self.on_extraction_finished)
+        self.frame_controller.extraction_progress.connect(self.on_extraction_progress)
 
         # 选中第一个按钮
         self.switch_function_panel(0)
 
+        # 后台读取配置文件
+        self._config_loader = ConfigLoader()
+        self._config_loader.config_loaded.connect(self._on_config_loaded)
+        self._config_loader.start()
+
+    def _on_config_loaded(self, loaded: dict) -> None:
+        """配置文件读取完成：合并到共享配置，刷新控件并加载首帧"""
+        # 原地更新，保持与 FrameController、TrainingPanel 共用同一个字典
+        self.config.clear()
+        self.config.update(loaded)
+        self._apply_config_to_widgets()
+
+        # 自动标注模型在预测开关打开时才加载（_initialize_panel_states 按配置恢复开关）
+        self._initialize_panel_states()
+        if self.training_panel is not None:
+            self.training_panel.load_config()
+        self._load_initial_frame()
+
+    def _apply_config_to_widgets(self) -> None:
+        """用配置值刷新构建界面时按默认配置填写的控件（不触发信号）"""
+        widgets = [self.file_line_edit, self.interval_spinbox, self.max_frames_spinbox,
+                   self.annotate_model_path_line_edit]
+        if self.settings_panel is not None:
+            widgets += [self.output_dir_line_edit, self.model_path_line_edit]
+        for widget in widgets:
+            widget.blockSignals(True)
+        self.file_line_edit.setText(self.config.get("video_path", ""))
+        self.interval_spinbox.setValue(self.config.get("frame_interval", 1))
+        self.max_frames_spinbox.setValue(self.config.get("max_frames") or 0)
+        if self.settings_panel is not None:
+            self.output_dir_line_edit.setText(self.config.get("output_dir", "./output"))
+            self.model_path_line_edit.setText(self.config.get("model_path", ""))
+        self.annotate_model_path_line_edit.setText(self.config.get("model_path", ""))
+        for widget in widgets:
+            widget.blockSignals(False)
+
+    def _load_initial_frame(self) -> None:
+        """启动时按配置进入视频/照片文件夹/磁盘帧模式并加载首帧"""
         # 优先检查是否有视频文件或照片文件夹，如果有则进入相应模式
+        # 磁盘帧列表只在需要时扫描，避免进入视频/文件夹模式前多余的目录遍历
         video_path = self.config.get("video_path", "")
-        if video_path and os.path.exists(video_path):
-            # 检查是文件还是文件夹
-            if os.path.isfile(video_path):
+        # 一次 stat 同时判断是否存在以及是文件还是文件夹（网络盘上每次 stat 都有延迟）
+        path_kind = Utils.path_kind(video_path)
+        if path_kind is not None:
+            if path_kind == "file":
                 # 视频文件模式
                 try:
                     self.frame_controller.open_video(video_path)
-                    # 清空磁盘帧列表，强制进入预览模式
-                    self.frame_controller.frame_files = []
                     # 读取首帧（从视频开头开始）
                     self.frame_controller.read_frame(0)
                 except Exception as e:
                     print(f"自动加载视频失败: {e}")
                     # 如果视频加载失败，回退到文件模式
+                    self.frame_controller.refresh_frame_files()
                     if self.frame_controller.frame_files:
                         self.frame_controller.load_frame(0)
-            elif os.path.isdir(video_path):
+            else:
                 # 照片文件夹模式
                 try:
                     self.frame_controller.open_image_folder(video_path)
-                    # 清空磁盘帧列表，强制进入文件夹模式
-                    self.frame_controller.frame_files = []
                     # 读取首张图片
                     self.frame_controller.load_image_from_folder(0)
                 except Exception as e:
                     print(f"自动加载照片文件夹失败: {e}")
                     # 如果文件夹加载失败，回退到文件模式
+                    self.frame_controller.refresh_frame_files()
                     if self.frame_controller.frame_files:
                         self.frame_controller.load_frame(0)
-        elif self.frame_controller.frame_files:
+        else:
             # 没有视频文件时，使用磁盘帧文件
-            self.frame_controller.load_frame(0)
+            self.frame_controller.refresh_frame_files()
+            if self.frame_controller.frame_files:
+                self.frame_controller.load_frame(0)
 
     def __del__(self):
         """析构函数，确保资源正确释放"""
         try:
-            if hasattr(self, 'frame_controller'):
-                self.frame_controller.close_video()
+            self.frame_controller.close_video()
         except Exception as e:
             print(f"释放资源时出错: {e}")
 
@@ -134,32 +226,26 @@ class MainWindow(QMainWindow):
     # =============================
     def create_top_button_bar(self, main_layout: QVBoxLayout) -> None:
         button_bar = QWidget()
-        button_bar.setStyleSheet("""
-            QWidget {
-                background-color: #495057;
-                border-radius: 8px;
-                padding: 12px;
-            }
-        """)
+        # 按钮栏和顶部按钮的样式只设置一次，选中状态通过 selected 属性切换
+        button_bar.setStyleSheet(styles.TOP_BUTTON_BAR_STYLE)
         button_bar.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
         button_layout = QHBoxLayout(button_bar)
         button_layout.setSpacing(15)
 
-        self.video_annotate_btn = ui_components.create_top_button("视频/图片标注")
-        self.video_annotate_btn.clicked.connect(lambda: self.switch_function_panel(0))
-        button_layout.addWidget(self.video_annotate_btn)
-
-        self.training_btn = ui_components.create_top_button("模型训练")
-        self.training_btn.clicked.connect(lambda: self.switch_function_panel(1))
-        button_layout.addWidget(self.training_btn)
-
-        self.label2yolo = ui_components.create_top_button("格式转换")
-        self.label2yolo.clicked.connect(lambda: self.switch_function_panel(2))
-        button_layout.addWidget(self.label2yolo)
-
-        self.settings_btn_top = ui_components.create_top_button("设置")
-        self.settings_btn_top.clicked.connect(lambda: self.switch_function_panel(3))
-        button_layout.addWidget(self.settings_btn_top)
+        # 顶部按钮：(文本, 属性名)，按顺序对应功能面板索引
+        top_buttons = [
+            ("视频/图片标注", "video_annotate_btn"),
+            ("模型训练", "training_btn"),
+            ("格式转换", "format_convert_btn"),
+            ("设置", "settings_btn_top"),
+        ]
+        self._top_buttons = []
+        for i, (text, attr) in enumerate(top_buttons):
+            btn = ui_components.create_top_button(text)
+            btn.clicked.connect(partial(self.switch_function_panel, i))
+            button_layout.addWidget(btn)
+            setattr(self, attr, btn)
+            self._top_buttons.append(btn)
 
         button_layout.addStretch()
         main_layout.addWidget(button_bar)
@@ -175,7 +261,9 @@ class MainWindow(QMainWindow):
 
         # 左侧：图片预览
         self.image_label = AnnotateCanvas()
-        self.image_label.original_pixmap = QPixmap()
+        # 画布创建后不再替换，按键和绘制模式直接转发给绑定好的方法
+        self._canvas_keypress = self.image_label.keyPressEvent
+        self._canvas_set_draw = self.image_label.set_draw_mode
         ui_components.create_image_display_area(middle_layout, self.image_label)
 
         # 右侧：功能区
@@ -192,12 +280,17 @@ class MainWindow(QMainWindow):
         
         # 创建各个功能面板
         self._create_video_annotate_panel()
-        self._create_training_panel()
-        self._create_format_conversion_panel()
-        self._create_settings_panel()
+
+        # 其余面板在首次切换时才构建，先放入占位页保持索引不变
+        self._panel_builders = {
+            1: self._create_training_panel,
+            2: self._create_format_conversion_panel,
+            3: self._create_settings_panel,
+        }
+        for _ in self._panel_builders:
+            self.function_panel.addWidget(QWidget())
         
-        # 初始化面板状态
-        self._initialize_panel_states()
+        # 面板状态依赖配置，等配置读取完成后在 _on_config_loaded 中初始化
         
         # 将功能面板添加到父布局
         parent_layout.addWidget(self.function_panel, stretch=1)
@@ -218,9 +311,9 @@ class MainWindow(QMainWindow):
          self.extract_btn, self.prev_frame_btn, self.next_frame_btn,
          self.frame_spinbox, self.goto_btn, self.frame_info_label, 
          self.save_prediction_btn, self.progress_slider, self.new_box_btn, 
-         self.refresh_btn, self.model_path_line_edit, self.model_browse_btn, 
-         self.model_status_label, self.prediction_switch, self.confidence_slider, 
-         self.confidence_value_label) = video_annotate_panel_data[1:]
+         self.refresh_btn, self.annotate_model_path_line_edit, self.model_browse_btn, 
+         self.annotate_model_status_label, self.prediction_switch, self.confidence_slider, 
+         self.confidence_value_label, self.extract_progress_bar) = video_annotate_panel_data[1:]
 
         # 连接信号槽
         self._connect_video_annotate_signals()
@@ -260,238 +353,96 @@ class MainWindow(QMainWindow):
 
     def _initialize_progress_controls(self) -> None:
         """初始化进度条相关控件"""
-        # 添加拖动状态标志
+        # 添加拖动状态标志（拖动期间不回写进度条位置）
         self.is_slider_dragging = False
-        
-        # 添加防抖定时器
-        self.progress_timer = QTimer()
-        self.progress_timer.setSingleShot(True)
-        self.progress_timer.timeout.connect(self._jump_to_progress_frame)
 
-    def _create_training_panel(self) -> None:
+    def _ensure_panel(self, index: int) -> None:
+        """首次切换到面板时构建并替换占位页"""
+        builder = self._panel_builders.pop(index, None)
+        if builder is None:
+            return
+        placeholder = self.function_panel.widget(index)
+        self.function_panel.insertWidget(index, builder())
+        self.function_panel.removeWidget(placeholder)
+        placeholder.deleteLater()
+
+    def _create_training_panel(self) -> QWidget:
         """创建训练面板"""
+        # 训练模块连带 yaml 等依赖，首次打开训练面板时才导入
+        from training_panel import TrainingPanel
         self.training_panel = TrainingPanel(self.config)
-        self.function_panel.addWidget(self.training_panel)
+        return self.training_panel
 
-    def _create_format_conversion_panel(self) -> None:
+    def _create_format_conversion_panel(self) -> QWidget:
         """创建格式转换面板"""
         self.format_conversion_panel = QWidget()
         layout = QVBoxLayout(self.format_conversion_panel)
         layout.setSpacing(15)
         layout.setContentsMargins(20, 20, 20, 20)
+        # 面板内控件共用一份样式表
+        self.format_conversion_panel.setStyleSheet(styles.FORMAT_CONVERSION_PANEL_STYLE)
         
         # 标题
         title_label = QLabel("Labelme转YOLO格式")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 20px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                font-weight: bold;
-                color: #2c3e50;
-                margin-bottom: 15px;
-            }
-        """)
+        title_label.setObjectName("convertTitle")
         layout.addWidget(title_label)
         
-        # 输入数据集选择组
-        input_group = QGroupBox("输入数据集")
-        input_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 16px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                color: #2c3e50;
-                padding-top: 15px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 5px 10px;
-            }
-        """)
-        input_group.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
-        
-        input_layout = QVBoxLayout(input_group)
-        input_layout.setSpacing(10)
-        
-        # 输入数据集路径
-        input_path_layout = QHBoxLayout()
-        input_path_layout.setSpacing(8)
-        input_path_label = QLabel("Labelme数据集路径:")
-        input_path_label.setStyleSheet("""
-            QLabel { 
-                font-weight: normal; 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-            }
-        """)
-        self.labelme_dir_line_edit = QLineEdit()
-        self.labelme_dir_line_edit.setPlaceholderText("请选择Labelme数据集文件夹")
-        self.labelme_dir_line_edit.setStyleSheet("""
-            QLineEdit { 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                padding: 6px;
-            }
-        """)
-        self.labelme_browse_btn = ui_components.create_button("浏览", styles.COLORS["primary"], "small")
-        
-        input_path_layout.addWidget(input_path_label)
-        input_path_layout.addWidget(self.labelme_dir_line_edit)
-        input_path_layout.addWidget(self.labelme_browse_btn)
-        input_layout.addLayout(input_path_layout)
-        
-        layout.addWidget(input_group)
-        
-        # 输出数据集选择组
-        output_group = QGroupBox("输出数据集")
-        output_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 16px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                color: #2c3e50;
-                padding-top: 15px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 5px 10px;
-            }
-        """)
-        output_group.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
-        
-        output_layout = QVBoxLayout(output_group)
-        output_layout.setSpacing(10)
-        
-        # 输出数据集路径
-        output_path_layout = QHBoxLayout()
-        output_path_layout.setSpacing(8)
-        output_path_label = QLabel("YOLO数据集输出路径:")
-        output_path_label.setStyleSheet("""
-            QLabel { 
-                font-weight: normal; 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-            }
-        """)
-        self.yolo_dir_line_edit = QLineEdit()
-        self.yolo_dir_line_edit.setPlaceholderText("请选择YOLO数据集输出文件夹")
-        self.yolo_dir_line_edit.setStyleSheet("""
-            QLineEdit { 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                padding: 6px;
-            }
-        """)
-        self.yolo_browse_btn = ui_components.create_button("浏览", styles.COLORS["primary"], "small")
-        
-        output_path_layout.addWidget(output_path_label)
-        output_path_layout.addWidget(self.yolo_dir_line_edit)
-        output_path_layout.addWidget(self.yolo_browse_btn)
-        output_layout.addLayout(output_path_layout)
-        
-        layout.addWidget(output_group)
-        
-        # 参数设置组
-        params_group = QGroupBox("转换参数")
-        params_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 16px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                color: #2c3e50;
-                padding-top: 15px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 5px 10px;
-            }
-        """)
-        params_group.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
-        
-        params_layout = QVBoxLayout(params_group)
-        params_layout.setSpacing(10)
-        
-        # 标签文件路径
-        label_path_layout = QHBoxLayout()
-        label_path_layout.setSpacing(8)
-        label_path_label = QLabel("标签文件路径:")
-        label_path_label.setStyleSheet("""
-            QLabel { 
-                font-weight: normal; 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-            }
-        """)
-        self.label_path_line_edit = QLineEdit()
-        self.label_path_line_edit.setPlaceholderText("请选择标签文件")
-        self.label_path_line_edit.setStyleSheet("""
-            QLineEdit { 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                padding: 6px;
-            }
-        """)
-        self.label_path_browse_btn = ui_components.create_button("浏览", styles.COLORS["primary"], "small")
-        
-        label_path_layout.addWidget(label_path_label)
-        label_path_layout.addWidget(self.label_path_line_edit)
-        label_path_layout.addWidget(self.label_path_browse_btn)
-        params_layout.addLayout(label_path_layout)
+        # 三个分组各含一行路径选择：(分组标题, 行标签, 占位提示, 输入框属性名, 浏览按钮属性名)
+        path_rows = [
+            ("输入数据集", "Labelme数据集路径:", "请选择Labelme数据集文件夹",
+             "labelme_dir_line_edit", "labelme_browse_btn"),
+            ("输出数据集", "YOLO数据集输出路径:", "请选择YOLO数据集输出文件夹",
+             "yolo_dir_line_edit", "yolo_browse_btn"),
+            ("转换参数", "标签文件路径:", "请选择标签文件",
+             "label_path_line_edit", "label_path_browse_btn"),
+        ]
+        # 分组标题 -> 分组内布局，其他控件按标题放入对应分组
+        group_layouts = {}
+        for group_title, label_text, placeholder, line_edit_attr, button_attr in path_rows:
+            group = QGroupBox(group_title)
+            group.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+            group_layout = QVBoxLayout(group)
+            group_layout.setSpacing(10)
+            group_layouts[group_title] = group_layout
+            
+            path_layout = QHBoxLayout()
+            path_layout.setSpacing(8)
+            line_edit = QLineEdit()
+            line_edit.setPlaceholderText(placeholder)
+            browse_btn = ui_components.create_button("浏览", styles.COLORS["primary"], "small")
+            setattr(self, line_edit_attr, line_edit)
+            setattr(self, button_attr, browse_btn)
+            
+            path_layout.addWidget(QLabel(label_text))
+            path_layout.addWidget(line_edit)
+            path_layout.addWidget(browse_btn)
+            group_layout.addLayout(path_layout)
+            layout.addWidget(group)
         
-        # 验证集比例和线程数
+        # 验证集比例和线程数，放在转换参数分组中
+        params_layout = group_layouts["转换参数"]
         val_thread_layout = QHBoxLayout()
         val_thread_layout.setSpacing(15)
         
         # 验证集比例
         val_size_layout = QVBoxLayout()
         val_size_label = QLabel("验证集比例 (0-1):")
-        val_size_label.setStyleSheet("""
-            QLabel { 
-                font-weight: normal; 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-            }
-        """)
         self.val_size_spinbox = QDoubleSpinBox()
         self.val_size_spinbox.setMinimum(0.0)
         self.val_size_spinbox.setMaximum(1.0)
         self.val_size_spinbox.setSingleStep(0.1)
         self.val_size_spinbox.setValue(0.2)
         self.val_size_spinbox.setDecimals(2)
-        self.val_size_spinbox.setStyleSheet("""
-            QDoubleSpinBox { 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                padding: 6px;
-            }
-        """)
         val_size_layout.addWidget(val_size_label)
         val_size_layout.addWidget(self.val_size_spinbox)
         
         # 线程数
         thread_layout = QVBoxLayout()
         thread_label = QLabel("线程数:")
-        thread_label.setStyleSheet("""
-            QLabel { 
-                font-weight: normal; 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-            }
-        """)
         self.thread_num_spinbox = QSpinBox()
         self.thread_num_spinbox.setMinimum(1)
         self.thread_num_spinbox.setMaximum(32)
         self.thread_num_spinbox.setValue(15)
-        self.thread_num_spinbox.setStyleSheet("""
-            QSpinBox { 
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                padding: 6px;
-            }
-        """)
         thread_layout.addWidget(thread_label)
         thread_layout.addWidget(self.thread_num_spinbox)
         
@@ -499,8 +450,6 @@ class MainWindow(QMainWindow):
         val_thread_layout.addLayout(thread_layout)
         params_layout.addLayout(val_thread_layout)
         
-        layout.addWidget(params_group)
-        
         # 转换按钮
         self.convert_btn = ui_components.create_button("开始转换", styles.COLORS["primary"], "large")
         self.convert_btn.setStyleSheet(styles.get_button_style("large", styles.COLORS["primary"]) + """
@@ -515,14 +464,7 @@ class MainWindow(QMainWindow):
         
         # 进度显示
         self.convert_progress_label = QLabel("准备就绪")
-        self.convert_progress_label.setStyleSheet("""
-            QLabel {
-                font-size: 14px;
-                font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                color: #6c757d;
-                margin-top: 10px;
-            }
-        """)
+        self.convert_progress_label.setObjectName("convertProgress")
         layout.addWidget(self.convert_progress_label)
         
         # 占位空间
@@ -530,12 +472,12 @@ class MainWindow(QMainWindow):
         
         # 设置面板的尺寸策略
         self.format_conversion_panel.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
-        self.function_panel.addWidget(self.format_conversion_panel)
         
         # 连接信号槽
         self._connect_format_conversion_signals()
+        return self.format_conversion_panel
 
-    def _create_settings_panel(self) -> None:
+    def _create_settings_panel(self) -> QWidget:
         """创建设置面板"""
         settings_panel_data = ui_components.create_settings_panel(self.config)
         self.settings_panel = settings_panel_data[0]
@@ -551,13 +493,17 @@ class MainWindow(QMainWindow):
         self.model_browse_btn.clicked.connect(self.select_model_file)
         self.settings_btn.clicked.connect(self.save_settings)
         
-        # 添加到功能面板
-        self.function_panel.addWidget(self.settings_panel)
+        # 同步构建前已变化的状态
+        self.update_model_status()
+        self.update_current_video_path_display()
+        return self.settings_panel
 
     def _initialize_panel_states(self) -> None:
         """初始化面板状态"""
         # 初始化模型状态显示
         self.update_model_status()
+        if self.auto_annotator.is_available():
+            self.update_model_status_annotate()
         
         # 初始化预测开关状态
         self.prediction_switch.setChecked(self.config.get("prediction_enabled", False))
@@ -639,29 +585,37 @@ class MainWindow(QMainWindow):
             self.convert_btn.setEnabled(False)
             self.convert_btn.setText("转换中...")
             
-            # 执行转换
-            success = label2yolo.convert_labelme_to_yolo(
-                labelme_dir=labelme_dir,
-                save_dir=save_dir,
-                label_path=label_path,
-                val_size=val_size,
-                thread_num=thread_num
-            )
-            
-            if success:
-                self.convert_progress_label.setText("转换完成！")
-                QMessageBox.information(self, "成功", f"Labelme到YOLO格式转换完成！\n输出目录: {save_dir}")
-            else:
-                self.convert_progress_label.setText("转换失败")
-                QMessageBox.warning(self, "错误", "格式转换失败，请检查输入数据")
+            # 后台线程执行转换，完成后由 on_conversion_finished 恢复界面
+            self._convert_save_dir = save_dir
+            self._convert_worker = ConvertWorker(labelme_dir, save_dir, label_path, val_size, thread_num)
+            self._convert_worker.progress_updated.connect(self.on_conversion_progress)
+            self._convert_worker.conversion_finished.connect(self.on_conversion_finished)
+            self._convert_worker.start()
             
         except Exception as e:
             QMessageBox.warning(self, "错误", f"转换过程中出错: {str(e)}")
             self.convert_progress_label.setText("转换出错")
-        finally:
             self.convert_btn.setEnabled(True)
             self.convert_btn.setText("开始转换")
 
+    def on_conversion_progress(self, done: int, total: int) -> None:
+        """更新格式转换进度"""
+        self.convert_progress_label.setText(f"正在转换... {done}/{total}")
+
+    def on_conversion_finished(self, success: bool, error: str) -> None:
+        """格式转换结束：恢复按钮并提示结果"""
+        self.convert_btn.setEnabled(True)
+        self.convert_btn.setText("开始转换")
+        if success:
+            self.convert_progress_label.setText("转换完成！")
+            QMessageBox.information(self, "成功", f"Labelme到YOLO格式转换完成！\n输出目录: {self._convert_save_dir}")
+        elif error:
+            self.convert_progress_label.setText("转换出错")
+            QMessageBox.warning(self, "错误", f"转换过程中出错: {error}")
+        else:
+            self.convert_progress_label.setText("转换失败")
+            QMessageBox.warning(self, "错误", "格式转换失败，请检查输入数据")
+
     # =============================
     # 辅助方法
     # =============================
@@ -669,21 +623,36 @@ class MainWindow(QMainWindow):
     # =============================
     # 文件选择与事件响应
     # =============================
+    def _exec_file_dialog(self, title: str, file_mode, name_filter: str = "") -> str:
+        """
+        复用同一个文件对话框选择视频文件或目录，避免每次点击都重新创建对话框
+        返回选中的路径，取消时返回空字符串
+        """
+        if self._file_dialog is None:
+            self._file_dialog = QFileDialog(self)
+            self._file_dialog.setDirectory("./")
+        dialog = self._file_dialog
+        dialog.setWindowTitle(title)
+        dialog.setFileMode(file_mode)
+        dialog.setOption(QFileDialog.ShowDirsOnly, file_mode == QFileDialog.Directory)
+        dialog.setNameFilter(name_filter)
+        if dialog.exec_() != QFileDialog.Accepted:
+            return ""
+        selected = dialog.selectedFiles()
+        return selected[0] if selected else ""
+
     def select_file(self, line_edit: QLineEdit, key: str, video_mode_btn: QPushButton = None, folder_mode_btn: QPushButton = None) -> None:
         """选择视频文件或照片文件夹"""
         # 根据当前选择的模式决定文件选择类型
         if folder_mode_btn and folder_mode_btn.isChecked():
             # 照片文件夹模式
-            folder_path = QFileDialog.getExistingDirectory(
-                self, "选择照片文件夹", "./"
-            )
+            folder_path = self._exec_file_dialog("选择照片文件夹", QFileDialog.Directory)
             if folder_path:
                 # 标准化路径
                 normalized_path = self.normalize_path(folder_path)
                 line_edit.setText(normalized_path)
                 self.config[key] = normalized_path
-                Utils.save_config(self.config)
-                self.frame_controller.config = self.config
+                self._mark_config_dirty()
                 
                 try:
                     # 打开照片文件夹进入"文件夹模式"
@@ -702,17 +671,15 @@ class MainWindow(QMainWindow):
                     QMessageBox.warning(self, "错误", str(e))
         else:
             # 视频文件模式
-            file_path, _ = QFileDialog.getOpenFileName(
-                self, "选择视频文件", "./", "视频文件 (*.mp4 *.avi *.mov);;所有文件 (*)"
-            )
+            file_path = self._exec_file_dialog("选择视频文件", QFileDialog.ExistingFile,
+                                               "视频文件 (*.mp4 *.avi *.mov);;所有文件 (*)")
 
             if file_path:
                 # 标准化路径
                 normalized_path = self.normalize_path(file_path)
                 line_edit.setText(normalized_path)
                 self.config[key] = normalized_path
-                Utils.save_config(self.config)
-                self.frame_controller.config = self.config
+                self._mark_config_dirty()
 
                 try:
                     # 打开视频进入"预览模式"
@@ -736,59 +703,45 @@ class MainWindow(QMainWindow):
             # 获取当前帧数据
             current_frame_mat = None
             
-            # 照片文件夹模式：从当前图片文件读取
-            if hasattr(self.frame_controller, "is_image_folder_mode") and self.frame_controller.is_image_folder_mode():
-                if (hasattr(self.frame_controller, 'current_frame_index') and 
-                    hasattr(self.frame_controller, 'image_files') and 
-                    self.frame_controller.current_frame_index < len(self.frame_controller.image_files)):
+            # 照片文件夹模式：优先使用显示时已解码的数组，后台解码尚未返回时才重新读取
+            if self.frame_controller.is_image_folder_mode():
+                if self.frame_controller.current_frame_index < len(self.frame_controller.image_files):
                     current_image_path = self.frame_controller.image_files[self.frame_controller.current_frame_index]
-                    current_frame_mat = cv2.imread(current_image_path)
+                    if self.current_frame_mat is not None and self._frame_mat_path == current_image_path:
+                        current_frame_mat = self.current_frame_mat
+                    else:
+                        current_frame_mat = cv2.imread(current_image_path)
             # 视频模式：使用缓存的帧数据
-            elif hasattr(self, 'current_frame_mat') and self.current_frame_mat is not None:
-                current_frame_mat = self.current_frame_mat
+            else:
+                current_frame_mat = self._ensure_frame_mat()
             
             if current_frame_mat is None:
                 QMessageBox.warning(self, "提示", "当前没有可用的帧数据")
                 return
             
             # 获取画布上的所有标注框（包括手动创建的和AI预测的）
-            boxes = []
-            if hasattr(self.image_label, 'get_boxes'):
-                boxes = self.image_label.get_boxes()
+            boxes = self.image_label.get_boxes()
             
-            # 如果没有标注框，尝试获取AI预测结果
+            # 如果没有标注框，尝试获取AI预测结果，当前帧已有批处理结果时直接使用
             if not boxes and self.prediction_switch.isChecked() and self.auto_annotator.is_available():
-                confidence_threshold = self.config.get("confidence_threshold", 0.5)
-                boxes = self.auto_annotator.predict(current_frame_mat, confidence_threshold)
+                boxes = self._prediction_cache.get(self._current_prediction_key())
+                if boxes is None:
+                    confidence_threshold = self.config.get("confidence_threshold", 0.5)
+                    boxes = self.auto_annotator.predict(current_frame_mat, confidence_threshold)
             
             if not boxes:
                 QMessageBox.information(self, "提示", "当前帧没有任何标注框，请先创建标注框或开启AI预测功能")
                 return
             
             # 获取输出名称并创建文件夹结构
-            input_path = self.config.get("video_path", "")
-            if input_path:
-                if os.path.isfile(input_path):
-                    # 视频文件模式：从视频路径中提取文件名
-                    output_name = os.path.splitext(os.path.basename(input_path))[0]
-                elif os.path.isdir(input_path):
-                    # 照片文件夹模式：从文件夹路径中提取文件夹名
-                    output_name = os.path.basename(input_path.rstrip(os.sep))
-                else:
-                    output_name = "unknown_input"
-            else:
-                output_name = "unknown_input"
+            output_name = self._input_output_name()
             
             # 创建基于输入名称的文件夹结构
             base_output_dir = self.config.get("output_dir", "./output")
             output_dir = os.path.join(base_output_dir, output_name)
             
-            # 确保目录存在
-            os.makedirs(output_dir, exist_ok=True)
-            os.makedirs(output_dir, exist_ok=True)
-            
             # 获取当前帧索引
-            current_frame_index = getattr(self.frame_controller, 'current_frame_index', 0)
+            current_frame_index = self.frame_controller.current_frame_index
             
             # 保存YOLO格式的txt文件
             txt_filename = f"frame_{current_frame_index:06d}.txt"
@@ -801,41 +754,52 @@ class MainWindow(QMainWindow):
             # 获取图像尺寸
             h, w = current_frame_mat.shape[:2]
             
-            # 保存图片
-            cv2.imwrite(image_path, current_frame_mat)
+            # 转换为YOLO格式 (center_x, center_y, width, height) 归一化，所有框一次计算
+            coords = np.array([box[:4] for box in boxes], dtype=np.float64)
+            x1, y1, x2, y2 = coords.T
+            yolo_boxes = np.column_stack(((x1 + x2) / 2.0 / w, (y1 + y2) / 2.0 / h,
+                                          (x2 - x1) / w, (y2 - y1) / h))
             
-            # 写入YOLO格式数据
-            with open(txt_path, 'w') as f:
-                for box in boxes:
-                    x1, y1, x2, y2, label = box
-                    
-                    # 转换为YOLO格式 (center_x, center_y, width, height) 归一化
-                    center_x = (x1 + x2) / 2.0 / w
-                    center_y = (y1 + y2) / 2.0 / h
-                    width = (x2 - x1) / w
-                    height = (y2 - y1) / h
-                    
-                    # 提取类别ID（假设所有检测都是同一类别，类别ID为0）
-                    class_id = 0
-                    
-                    # 写入YOLO格式行：class_id center_x center_y width height
-                    f.write(f"{class_id} {center_x:.6f} {center_y:.6f} {width:.6f} {height:.6f}\n")
+            # YOLO格式行：class_id center_x center_y width height，拼成整个文件内容一次写入
+            # 类别ID（假设所有检测都是同一类别，类别ID为0）；重复模板一次 % 格式化所有框
+            label_text = (_YOLO_LINE_FORMAT * len(yolo_boxes)) % tuple(yolo_boxes.ravel().tolist())
             
-            QMessageBox.information(self, "成功", f"标注结果已保存到输出文件夹:\n输入: {output_name}\n图片: {image_path}\n标注: {txt_path}\n共保存 {len(boxes)} 个标注框")
+            # 创建目录、编码图片和写文件在保存线程中进行，完成后由 on_save_finished 提示
+            # 帧数组每次解码都是新分配的，不会被后续帧覆盖，无需复制
+            if self._save_worker is None:
+                self._save_worker = FrameSaveWorker()
+                self._save_worker.save_finished.connect(self.on_save_finished)
+                self._save_worker.start()
+            task = {
+                "output_dir": output_dir, "image_path": image_path, "txt_path": txt_path,
+                "frame": current_frame_mat, "quality": self.config.get("quality", 95),
+                "label_text": label_text, "box_count": len(boxes), "output_name": output_name,
+            }
+            if not self._save_worker.submit(task):
+                QMessageBox.warning(self, "提示", "保存任务过多，请等待之前的保存完成")
             
         except Exception as e:
             QMessageBox.warning(self, "错误", f"保存预测结果时出错: {str(e)}")
 
+    def on_save_finished(self, task: dict, error: str) -> None:
+        """保存线程写入完成：提示保存结果"""
+        if error:
+            QMessageBox.warning(self, "错误", f"保存预测结果时出错: {error}")
+            return
+        QMessageBox.information(self, "成功", f"标注结果已保存到输出文件夹:\n输入: {task['output_name']}\n图片: {task['image_path']}\n标注: {task['txt_path']}\n共保存 {task['box_count']} 个标注框")
+
     def select_output_dir(self) -> None:
         """选择输出目录"""
-        directory = QFileDialog.getExistingDirectory(self, "选择输出目录", "./")
+        directory = self._exec_file_dialog("选择输出目录", QFileDialog.Directory)
         if directory:
             # 标准化路径
             normalized_path = self.normalize_path(directory)
             self.output_dir_line_edit.setText(normalized_path)
             self.config["output_dir"] = normalized_path
-            Utils.save_config(self.config)
-            self.frame_controller.config = self.config
+            self._mark_config_dirty()
+            self.frame_controller.on_output_dir_changed(normalized_path)
+            if self._save_worker is not None:
+                self._save_worker.forget_created_dirs()
             # 更新当前视频输出目录显示
             self.update_current_video_path_display()
     
@@ -849,14 +813,12 @@ class MainWindow(QMainWindow):
             # 标准化路径
             normalized_path = self.normalize_path(file_path)
             self.model_path_line_edit.setText(normalized_path)
+            self.annotate_model_path_line_edit.setText(normalized_path)
             self.config["model_path"] = normalized_path
-            Utils.save_config(self.config)
-            
-            # 重新初始化自动标注器
-            self.auto_annotator = AutoAnnotator(normalized_path)
+            self._mark_config_dirty()
             
-            # 更新模型状态显示
-            self.update_model_status()
+            # 后台重新加载自动标注器，完成后更新模型状态显示；重复选择同一模型时不重新加载
+            self._ensure_model_loaded()
     
     def select_model_file_annotate(self) -> None:
         """选择YOLO模型文件（标注面板）"""
@@ -866,76 +828,89 @@ class MainWindow(QMainWindow):
         if file_path:
             # 标准化路径
             normalized_path = self.normalize_path(file_path)
-            self.model_path_line_edit.setText(normalized_path)
+            self.annotate_model_path_line_edit.setText(normalized_path)
+            if self.settings_panel is not None:
+                self.model_path_line_edit.setText(normalized_path)
             self.config["model_path"] = normalized_path
-            Utils.save_config(self.config)
-            
-            # 重新初始化自动标注器
-            print(f"正在加载新模型: {normalized_path}")
-            self.auto_annotator = AutoAnnotator(normalized_path)
-            
-            # 检查模型是否成功加载
-            if self.auto_annotator.is_available():
-                print(f"模型加载成功，类别数量: {len(self.auto_annotator.class_names)}")
-                print(f"类别名称: {self.auto_annotator.class_names}")
-            else:
-                print("模型加载失败")
-            
-            # 更新模型状态显示
-            self.update_model_status_annotate()
+            self._mark_config_dirty()
             
-            # 如果当前在视频标注面板且有帧数据，立即刷新预测
-            if (self.function_panel.currentIndex() == 0 and 
-                hasattr(self, 'current_frame_mat') and 
-                self.current_frame_mat is not None and 
-                self.prediction_switch.isChecked()):
-                print("模型更新后立即刷新预测...")
-                self.refresh_prediction()
+            # 后台重新加载自动标注器，完成后更新模型状态并刷新当前帧的预测
+            self._ensure_model_loaded()
     
+    def _ensure_model_loaded(self) -> None:
+        """
+        按需加载配置中的模型，选择模型、保存设置和打开预测都经过这里
+        已加载、正在加载或加载失败的同一文件不重复加载，文件被覆盖（修改时间变化）时重新加载
+        """
+        model_path = self.config.get("model_path", "")
+        model_mtime = self._model_mtime(model_path)
+        if model_path != self._last_model_path or model_mtime != self._last_model_mtime:
+            self._load_model_async(model_path, model_mtime)
+
+    @staticmethod
+    def _model_mtime(model_path: str) -> Optional[float]:
+        """模型文件的修改时间，路径为空或文件不存在时返回 None"""
+        if not model_path:
+            return None
+        try:
+            return os.path.getmtime(model_path)
+        except OSError:
+            return None
+
+    def _load_model_async(self, model_path: str, model_mtime: Optional[float] = None) -> None:
+        """在后台线程加载模型，完成后由 _on_model_loaded 替换自动标注器"""
+        if model_path:
+            print(f"正在加载模型: {model_path}")
+        self._last_model_path = model_path
+        self._last_model_mtime = model_mtime
+        # 按当前帧尺寸预热，首次预测不再承担初始化开销
+        frame_shape = self.current_frame_mat.shape if self.current_frame_mat is not None else None
+        loader = ModelLoader(model_path, frame_shape)
+        loader.model_loaded.connect(self._on_model_loaded)
+        # 线程结束后才释放引用，避免运行中的 QThread 被回收
+        loader.finished.connect(lambda: self._model_loaders.remove(loader))
+        self._model_loaders.append(loader)
+        loader.start()
+
+    def _on_model_loaded(self, annotator: AutoAnnotator) -> None:
+        """模型加载完成：替换自动标注器，更新状态显示并刷新当前帧的预测"""
+        # 加载期间又选择了其他模型时丢弃旧结果
+        if annotator.model_path != self._last_model_path:
+            return
+        self.auto_annotator = annotator
+        if annotator.is_available():
+            print(f"模型加载成功，类别数量: {len(annotator.class_names)}")
+            state = True
+        else:
+            state = False if annotator.model_path else None
+        if self.settings_panel is not None:
+            self._set_model_status(self.model_status_label, state)
+        self._set_model_status(self.annotate_model_status_label, state)
+
+        # 如果当前在视频标注面板且有帧数据，立即刷新预测
+        if self.function_panel.currentIndex() == 0 and self.prediction_switch.isChecked():
+            self._request_prediction()
+
     def toggle_prediction_switch(self, checked: bool) -> None:
-        """切换预测开关"""
+        """切换预测开关，开关颜色由样式表的 checked 属性选择器决定"""
+        self.prediction_switch.setText("开启" if checked else "关闭")
+        # 属性变化后需要重新polish才能应用属性选择器
+        self.prediction_switch.style().unpolish(self.prediction_switch)
+        self.prediction_switch.style().polish(self.prediction_switch)
+        
+        # 首次打开预测时才加载模型
         if checked:
-            self.prediction_switch.setText("开启")
-            self.prediction_switch.setStyleSheet("""
-                QPushButton {
-                    background-color: #28a745;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    font-size: 14px;
-                    font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                }
-                QPushButton:hover {
-                    background-color: #218838;
-                }
-            """)
-        else:
-            self.prediction_switch.setText("关闭")
-            self.prediction_switch.setStyleSheet("""
-                QPushButton {
-                    background-color: #dc3545;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    font-size: 14px;
-                    font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                }
-                QPushButton:hover {
-                    background-color: #c82333;
-                }
-            """)
+            self._ensure_model_loaded()
         
         # 保存预测开关状态
         self.config["prediction_enabled"] = checked
-        Utils.save_config(self.config)
+        self._mark_config_dirty()
     
     def update_confidence_value(self, value: int) -> None:
         """更新置信度值显示"""
         self.confidence_value_label.setText(f"{value}%")
         self.config["confidence_threshold"] = value / 100.0
-        Utils.save_config(self.config)
+        self._mark_config_dirty()
     
     def on_mode_changed(self) -> None:
         """处理模式切换事件"""
@@ -943,39 +918,41 @@ class MainWindow(QMainWindow):
             # 照片文件夹模式：禁用提取帧按钮
             self.extract_btn.setEnabled(False)
             self.extract_btn.setText("照片文件夹模式无需提取")
-            self.extract_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #6c757d;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 8px 16px;
-                    font-size: 16px;
-                    font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                }
-            """)
+            self._set_style_sheet(self.extract_btn, styles.EXTRACT_BUTTON_FOLDER_STYLE)
         else:
             # 视频文件模式：启用提取帧按钮
             self.extract_btn.setEnabled(True)
             self.extract_btn.setText("提取帧")
-            self.extract_btn.setStyleSheet(styles.get_button_style("medium", styles.COLORS["primary"]) + """
-                QPushButton {
-                    font-size: 16px;
-                    font-weight: bold;
-                    min-height: 35px;
-                }
-            """)
+            self._set_style_sheet(self.extract_btn, styles.EXTRACT_BUTTON_STYLE)
     
+    def _input_output_name(self) -> str:
+        """当前输入（视频文件或照片文件夹）对应的输出文件夹名，输入路径不变时直接使用上次结果"""
+        input_path = self.config.get("video_path", "")
+        cached_path, cached_name = self._output_name_cache
+        if input_path and input_path == cached_path:
+            return cached_name
+        input_kind = Utils.path_kind(input_path)
+        if input_kind == "file":
+            # 视频文件模式：从视频路径中提取文件名
+            output_name = os.path.splitext(os.path.basename(input_path))[0]
+        elif input_kind == "dir":
+            # 照片文件夹模式：从文件夹路径中提取文件夹名
+            output_name = os.path.basename(input_path.rstrip(os.sep))
+        else:
+            # 路径不存在时不缓存，之后创建了同名文件仍能得到正确名称
+            return "unknown_input"
+        self._output_name_cache = (input_path, output_name)
+        return output_name
+
     def normalize_path(self, path: str) -> str:
         """标准化路径格式，统一使用正斜杠"""
         if not path:
             return ""
-        # 将反斜杠转换为正斜杠，并处理重复的斜杠
-        normalized = path.replace("\\", "/")
-        # 处理重复的斜杠
-        while "//" in normalized:
-            normalized = normalized.replace("//", "/")
-        return normalized
+        # 已经标准化过的路径（如来自配置）原样返回
+        if "\\" not in path and "//" not in path:
+            return path
+        # 将反斜杠转换为正斜杠，重复的斜杠一次合并
+        return _REPEATED_SLASHES.sub("/", path.replace("\\", "/"))
     
     def get_current_video_output_dir(self) -> str:
         """获取当前视频的输出目录"""
@@ -989,12 +966,16 @@ class MainWindow(QMainWindow):
         return os.path.join(base_output_dir, video_name)
     
     def update_current_video_path_display(self) -> None:
-        """更新当前视频输出目录显示"""
-        if hasattr(self, 'current_video_path_label'):
+        """更新当前视频输出目录显示，视频路径和输出目录都未变化时不做任何处理"""
+        if self.settings_panel is not None:
             video_path = self.config.get("video_path", "")
+            base_output_dir = self.config.get("output_dir", "./output")
+            display_key = (video_path, base_output_dir if video_path else None)
+            if display_key == self._video_path_display_key:
+                return
+            self._video_path_display_key = display_key
             if video_path:
                 video_name = os.path.splitext(os.path.basename(video_path))[0]
-                base_output_dir = self.config.get("output_dir", "./output")
                 video_output_dir = os.path.join(base_output_dir, video_name)
                 
                 # 标准化路径显示
@@ -1003,39 +984,15 @@ class MainWindow(QMainWindow):
                 # 显示完整的文件夹结构
                 display_text = f"{normalized_path}\n├── images/\n└── labels/"
                 self.current_video_path_label.setText(display_text)
-                self.current_video_path_label.setStyleSheet("""
-                    QLabel { 
-                        font-weight: normal; 
-                        font-size: 14px;
-                        font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                        color: #2c3e50;
-                        background-color: #e8f5e8;
-                        border: 1px solid #28a745;
-                        border-radius: 4px;
-                        padding: 8px;
-                        margin-top: 5px;
-                    }
-                """)
+                self._set_style_sheet(self.current_video_path_label, styles.OUTPUT_PATH_STYLES[True])
             else:
                 self.current_video_path_label.setText("未选择视频")
-                self.current_video_path_label.setStyleSheet("""
-                    QLabel { 
-                        font-weight: normal; 
-                        font-size: 14px;
-                        font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                        color: #6c757d;
-                        background-color: #f8f9fa;
-                        border: 1px solid #ddd;
-                        border-radius: 4px;
-                        padding: 8px;
-                        margin-top: 5px;
-                    }
-                """)
+                self._set_style_sheet(self.current_video_path_label, styles.OUTPUT_PATH_STYLES[False])
     
     def set_max_frames_limit(self) -> None:
         """设置最大帧数限制为当前视频的总帧数或照片文件夹中的图片数量"""
         # 检查照片文件夹模式
-        if hasattr(self.frame_controller, "is_image_folder_mode") and self.frame_controller.is_image_folder_mode():
+        if self.frame_controller.is_image_folder_mode():
             try:
                 total_frames = self.frame_controller.total_frames
                 if total_frames <= 0:
@@ -1067,15 +1024,11 @@ class MainWindow(QMainWindow):
         
         try:
             # 获取视频的总帧数
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
+            total_frames = self._video_frame_count(video_path)
+            if total_frames is None:
                 QMessageBox.warning(self, "错误", "无法打开视频文件")
                 return
             
-            # 获取视频的总帧数
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            cap.release()
-            
             if total_frames <= 0:
                 QMessageBox.warning(self, "错误", "无法获取视频帧数信息")
                 return
@@ -1096,18 +1049,39 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "错误", f"获取视频帧数时出错: {str(e)}")
     
+    def _video_frame_count(self, video_path: str) -> Optional[int]:
+        """
+        获取视频总帧数，无法打开视频时返回 None
+        正在预览的视频直接使用读取器的帧数，其他视频按 (路径, 修改时间) 缓存探测结果
+        """
+        controller = self.frame_controller
+        if controller.is_preview_mode() and self.normalize_path(controller.video_path) == self.normalize_path(video_path):
+            return controller.total_frames
+        try:
+            key = (video_path, os.path.getmtime(video_path))
+        except OSError:
+            return None
+        total_frames = self._frame_count_cache.get(key)
+        if total_frames is None:
+            cap = cv2.VideoCapture(video_path)
+            if not cap.isOpened():
+                return None
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
+            self._frame_count_cache[key] = total_frames
+        return total_frames
+
     def auto_set_max_frames(self) -> None:
         """自动设置最大帧数为当前视频的总帧数或照片文件夹中的图片数量"""
         try:
             # 照片文件夹模式
-            if hasattr(self.frame_controller, "is_image_folder_mode") and self.frame_controller.is_image_folder_mode():
+            if self.frame_controller.is_image_folder_mode():
                 total_frames = self.frame_controller.total_frames
                 if total_frames > 0:
                     # 更新SpinBox的最大值
                     self.max_frames_spinbox.setMaximum(total_frames)
                     # 设置当前值为图片总数
                     self.max_frames_spinbox.setValue(total_frames)
-                    print(f"自动设置最大帧数为照片文件夹中的图片数量: {total_frames}")
                 return
             
             # 视频模式
@@ -1115,63 +1089,33 @@ class MainWindow(QMainWindow):
             if not video_path:
                 return
                 
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
-                return
-            
             # 获取视频的总帧数
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            cap.release()
-            
-            if total_frames > 0:
+            total_frames = self._video_frame_count(video_path)
+            if total_frames:
                 # 更新SpinBox的最大值
                 self.max_frames_spinbox.setMaximum(total_frames)
                 # 设置当前值为视频总帧数
                 self.max_frames_spinbox.setValue(total_frames)
-                print(f"自动设置最大帧数为: {total_frames}")
                 
         except Exception as e:
             print(f"自动设置最大帧数时出错: {str(e)}")
     
     def refresh_prediction(self) -> None:
         """刷新预测结果"""
-        print("=== 刷新预测开始 ===")
-        print(f"当前面板索引: {self.function_panel.currentIndex()}")
-        print(f"当前帧数据: {self.current_frame_mat is not None}")
-        print(f"预测开关状态: {self.prediction_switch.isChecked()}")
-        print(f"模型可用性: {self.auto_annotator.is_available()}")
-        
         # 检查是否在视频标注面板且当前帧不为空
-        if (self.function_panel.currentIndex() == 0 and self.current_frame_mat is not None):
-            # 清空当前标注框
-            if hasattr(self.image_label, 'clear_boxes'):
-                self.image_label.clear_boxes()
-                print("已清空当前标注框")
-            
-            # 如果预测开关开启，重新进行预测
-            if self.prediction_switch.isChecked():
-                confidence_threshold = self.config.get("confidence_threshold", 0.5)
-                print(f"使用置信度阈值: {confidence_threshold}")
-                print(f"当前帧形状: {self.current_frame_mat.shape}")
-                
-                boxes = self.auto_annotator.predict(self.current_frame_mat, confidence_threshold)
-                print(f"预测结果: {len(boxes)} 个检测框")
-                
-                if boxes:
-                    self.image_label.load_boxes(boxes)
-                    print(f"刷新预测完成，检测到 {len(boxes)} 个目标")
-                    for i, box in enumerate(boxes):
-                        print(f"  目标 {i+1}: {box}")
-                else:
-                    print("刷新预测完成，未检测到目标")
-            else:
-                print("预测开关已关闭，跳过预测")
-        else:
-            if self.function_panel.currentIndex() != 0:
-                print("当前不在视频标注面板")
-            if self.current_frame_mat is None:
-                print("当前帧数据为空")
-        print("=== 刷新预测结束 ===")
+        frame_mat = self._ensure_frame_mat() if self.function_panel.currentIndex() == 0 else None
+        if frame_mat is None:
+            return
+        # 清空当前标注框
+        self.image_label.clear_boxes()
+        self._shown_prediction_key = None
+        
+        # 如果预测开关开启，重新进行预测
+        if self.prediction_switch.isChecked():
+            confidence_threshold = self.config.get("confidence_threshold", 0.5)
+            boxes = self.auto_annotator.predict(frame_mat, confidence_threshold)
+            if boxes:
+                self.image_label.load_boxes(boxes)
     
     def save_settings(self) -> None:
         """保存设置"""
@@ -1179,285 +1123,476 @@ class MainWindow(QMainWindow):
         self.config["output_dir"] = self.normalize_path(self.output_dir_line_edit.text())
         self.config["model_path"] = self.normalize_path(self.model_path_line_edit.text())
         
-        # 保存配置
-        Utils.save_config(self.config)
-        self.frame_controller.config = self.config
+        # 保存配置（后台写入）
+        self._config_dirty_timer.stop()
+        self._flush_config()
+        self.frame_controller.on_output_dir_changed(self.config["output_dir"])
         
-        # 如果模型路径发生变化，重新初始化自动标注器
-        if self.config["model_path"] != getattr(self, '_last_model_path', ''):
-            self.auto_annotator = AutoAnnotator(self.config["model_path"])
-            self._last_model_path = self.config["model_path"]
-            
-            # 更新模型状态显示
-            if self.auto_annotator.is_available():
-                self.model_status_label.setText("模型状态: 已加载")
-                self.model_status_label.setStyleSheet("""
-                    QLabel { 
-                        font-weight: normal; 
-                        font-size: 14px;
-                        font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                        color: #28a745;
-                        margin-top: 5px;
-                    }
-                """)
-            else:
-                self.model_status_label.setText("模型状态: 加载失败")
-                self.model_status_label.setStyleSheet("""
-                    QLabel { 
-                        font-weight: normal; 
-                        font-size: 14px;
-                        font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                        color: #dc3545;
-                        margin-top: 5px;
-                    }
-                """)
+        # 模型路径或文件发生变化时后台重新加载自动标注器，完成后更新模型状态显示
+        self._ensure_model_loaded()
         
         QMessageBox.information(self, "成功", "设置已保存！")
     
+    def _set_model_status(self, label: QLabel, state) -> None:
+        """设置模型状态标签：True 已加载，False 加载失败，None 未加载；样式未变时不重新设置"""
+        texts = {True: "已加载", False: "加载失败", None: "未加载"}
+        label.setText(f"模型状态: {texts[state]}")
+        self._set_style_sheet(label, styles.MODEL_STATUS_STYLES[state])
+
+    @staticmethod
+    def _set_style_sheet(widget, style: str) -> None:
+        """样式表变化时才重新设置，避免Qt重复解析样式表并重新polish控件"""
+        if widget.styleSheet() != style:
+            widget.setStyleSheet(style)
+
     def update_model_status(self) -> None:
         """更新模型状态显示（设置面板）"""
-        if hasattr(self, 'model_status_label'):
+        if self.settings_panel is not None:
             if self.auto_annotator.is_available():
-                self.model_status_label.setText("模型状态: 已加载")
-                self.model_status_label.setStyleSheet("""
-                    QLabel { 
-                        font-weight: normal; 
-                        font-size: 14px;
-                        font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                        color: #28a745;
-                        margin-top: 5px;
-                    }
-                """)
+                state = True
             else:
-                self.model_status_label.setText("模型状态: 未加载")
-                self.model_status_label.setStyleSheet("""
-                    QLabel { 
-                        font-weight: normal; 
-                        font-size: 14px;
-                        font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                        color: #6c757d;
-                        margin-top: 5px;
-                    }
-                """)
+                state = False if self.auto_annotator.model_path else None
+            self._set_model_status(self.model_status_label, state)
     
     def update_model_status_annotate(self) -> None:
         """更新模型状态显示（标注面板）"""
-        if hasattr(self, 'model_status_label'):
-            if self.auto_annotator.is_available():
-                self.model_status_label.setText("模型状态: 已加载")
-                self.model_status_label.setStyleSheet("""
-                    QLabel { 
-                        font-weight: normal; 
-                        font-size: 14px;
-                        font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                        color: #28a745;
-                        margin-top: 5px;
-                    }
-                """)
-            else:
-                self.model_status_label.setText("模型状态: 加载失败")
-                self.model_status_label.setStyleSheet("""
-                    QLabel { 
-                        font-weight: normal; 
-                        font-size: 14px;
-                        font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-                        color: #dc3545;
-                        margin-top: 5px;
-                    }
-                """)
+        self._set_model_status(self.annotate_model_status_label, self.auto_annotator.is_available())
 
     # =============================
     # 其他逻辑保持不变
     # =============================
     def switch_function_panel(self, index: int) -> None:
+        self._ensure_panel(index)
         self.function_panel.setCurrentIndex(index)
-        buttons = [self.video_annotate_btn, self.training_btn, self.label2yolo, self.settings_btn_top]
-        for i, btn in enumerate(buttons):
-            btn.setStyleSheet(styles.get_top_button_style(selected=(i == index)))
+        # 只有选中状态变化的按钮（原选中和新选中的两个）需要重新polish
+        for i, btn in enumerate(self._top_buttons):
+            selected = i == index
+            if btn.property("selected") == selected:
+                continue
+            btn.setProperty("selected", selected)
+            # 属性变化后需要重新polish才能应用属性选择器
+            btn.style().unpolish(btn)
+            btn.style().polish(btn)
         
         # 控制图像标注画布的编辑状态
-        if hasattr(self, 'image_label') and isinstance(self.image_label, AnnotateCanvas):
-            if index == 0:  # 视频标注面板
-                self.image_label.set_edit_enabled(True)
-                self.image_label.set_draw_mode(self.new_box_btn.isChecked())
-                
-                # 切换到视频标注面板时，如果当前帧不为空且预测开关开启，进行自动标注
-                if self.current_frame_mat is not None and self.prediction_switch.isChecked():
-                    confidence_threshold = self.config.get("confidence_threshold", 0.5)
-                    boxes = self.auto_annotator.predict(self.current_frame_mat, confidence_threshold)
-                    if boxes:
-                        self.image_label.load_boxes(boxes)
-            else:  # 离开标注面板
-                self.image_label.set_edit_enabled(False)
-                self.new_box_btn.setChecked(False)
-                self.image_label.set_draw_mode(False)
+        if index == 0:  # 视频标注面板
+            self.image_label.set_edit_enabled(True)
+            self.image_label.set_draw_mode(self.new_box_btn.isChecked())
+            
+            # 切换到视频标注面板时，如果当前帧不为空且预测开关开启，进行自动标注
+            if self.prediction_switch.isChecked():
+                self._request_prediction()
+        else:  # 离开标注面板
+            self.image_label.set_edit_enabled(False)
+            self.new_box_btn.setChecked(False)
+            self.image_label.set_draw_mode(False)
 
     def extract_frames_handler(self) -> None:
-        self.config["video_path"] = self.video_line_edit.text()
+        self.config["video_path"] = self.file_line_edit.text()
         self.config["frame_interval"] = self.interval_spinbox.value()
         self.config["max_frames"] = (
             self.max_frames_spinbox.value() if self.max_frames_spinbox.value() > 0 else None
         )
-        Utils.save_config(self.config)
-        self.frame_controller.config = self.config
+        self._mark_config_dirty()
         self.extract_btn.setText("提取中...")
         self.extract_btn.setEnabled(False)
+        self.extract_progress_bar.setValue(0)
+        self.extract_progress_bar.setVisible(True)
+        # 后台线程提取，界面保持可操作
         self.frame_controller.extract_frames()
 
+    def on_extraction_progress(self, done: int, total: int) -> None:
+        """更新提帧进度条"""
+        if total > 0:
+            self.extract_progress_bar.setValue(min(100, int(done * 100 / total)))
+
     def on_extraction_finished(self, success: bool) -> None:
         self.extract_btn.setText("提取帧")
         self.extract_btn.setEnabled(True)
+        self.extract_progress_bar.setVisible(False)
         if success:
+            # 帧文件已重新生成，旧缓存失效
+            self.pixmap_cache.clear()
+            self._prediction_cache.clear()
             self.frame_controller.refresh_frame_files()
 
     def goto_frame(self) -> None:
         target_index = self.frame_spinbox.value()
+        # 目标帧就是当前显示的帧时不做任何处理
+        if self._is_current_frame(target_index):
+            return
+        # 跳转不是连续翻页，预读回到前后各一帧
+        self._set_nav_direction(0)
         # 照片文件夹模式优先
-        if hasattr(self.frame_controller, "is_image_folder_mode") and self.frame_controller.is_image_folder_mode():
+        if self.frame_controller.is_image_folder_mode():
             self.frame_controller.goto_image_from_folder(target_index)
         # 预览模式：有 VideoCapture 就直接读视频帧
-        elif hasattr(self.frame_controller, "is_preview_mode") and self.frame_controller.is_preview_mode():
-            self.frame_controller.read_frame(target_index)
+        elif self.frame_controller.is_preview_mode():
+            self.frame_controller.read_frame_fast(target_index)
         elif self.frame_controller.frame_files:
             self.frame_controller.goto_frame(target_index)
 
+    def _set_nav_direction(self, direction: int) -> None:
+        """记录翻页方向和同方向连续翻页次数，方向改变时取消另一侧尚未开始的预读"""
+        if direction != self._nav_direction:
+            self.pixmap_cache.cancel_prefetch()
+            self._nav_streak = 0
+        self._nav_direction = direction
+        if direction:
+            self._nav_streak += 1
+
     def previous_frame(self) -> None:
+        self._set_nav_direction(-1)
         interval = self.interval_spinbox.value()
         # 照片文件夹模式优先
-        if hasattr(self.frame_controller, "is_image_folder_mode") and self.frame_controller.is_image_folder_mode():
+        if self.frame_controller.is_image_folder_mode():
             self.frame_controller.previous_image_from_folder(interval)
         # 预览模式
-        elif hasattr(self.frame_controller, "is_preview_mode") and self.frame_controller.is_preview_mode():
+        elif self.frame_controller.is_preview_mode():
             self.frame_controller.previous_frame_preview(interval)
         elif self.frame_controller.frame_files:
             self.frame_controller.previous_frame(interval)
 
     def next_frame(self) -> None:
+        self._set_nav_direction(1)
         interval = self.interval_spinbox.value()
         # 照片文件夹模式优先
-        if hasattr(self.frame_controller, "is_image_folder_mode") and self.frame_controller.is_image_folder_mode():
+        if self.frame_controller.is_image_folder_mode():
             self.frame_controller.next_image_from_folder(interval)
         # 预览模式
-        elif hasattr(self.frame_controller, "is_preview_mode") and self.frame_controller.is_preview_mode():
+        elif self.frame_controller.is_preview_mode():
             self.frame_controller.next_frame_preview(interval)
         elif self.frame_controller.frame_files:
             self.frame_controller.next_frame(interval)
 
+    def _queue_loaded_frame(self, frame_data) -> None:
+        """记录最新到达的帧，同一轮事件中先到的帧直接被覆盖"""
+        scheduled = self._pending_frame_data is not None
+        self._pending_frame_data = frame_data
+        if not scheduled:
+            QTimer.singleShot(0, self._process_latest_frame)
+
+    def _process_latest_frame(self) -> None:
+        frame_data, self._pending_frame_data = self._pending_frame_data, None
+        if frame_data is not None:
+            self.on_frame_loaded(frame_data)
+
     def on_frame_loaded(self, frame_data) -> None:
         """支持两种类型：文件路径 或 OpenCV图像矩阵"""
-        import numpy as np
-        pixmap = None
+        cached = None
+        if isinstance(frame_data, str):
+            cached = self.pixmap_cache.lookup(frame_data)
+            # 同一帧且显示的就是缓存中的图像时无需重复解码和重绘
+            if (cached is not None and frame_data == self._current_frame_path
+                    and self.image_label.base_pixmap is not None
+                    and cached[0].cacheKey() == self.image_label.base_pixmap.cacheKey()):
+                return
 
-        # 如果是字符串路径（文件模式或照片文件夹模式）
+        # 新帧到来，之前尚未完成的后台解码全部作废
+        self._decode_generation += 1
+        self._decode_signals.latest_generation = self._decode_generation
+        self._refresh_signals.latest_generation = self._decode_generation
+        self._lookahead_signals.latest_generation = self._decode_generation
+        self._shown_prediction_key = None
+
+        # 如果是字符串路径（文件模式或照片文件夹模式）：交给线程池解码
         if isinstance(frame_data, str):
-            pixmap = QPixmap(frame_data)
-            # 为了支持预测功能，需要将图片文件加载为numpy数组
-            try:
-                # 使用OpenCV读取图片文件为numpy数组
-                frame_mat = cv2.imread(frame_data)
-                if frame_mat is not None:
-                    self.current_frame_mat = frame_mat.copy()
-                    print(f"照片文件夹模式：成功加载图片为numpy数组，形状: {frame_mat.shape}")
-                else:
-                    print(f"照片文件夹模式：无法读取图片文件: {frame_data}")
+            self._current_frame_path = frame_data
+            # 原图数组只在需要预测且没有缓存结果时才解码
+            key = self._current_prediction_key()
+            load_mat = (self.function_panel.currentIndex() == 0 and self.prediction_switch.isChecked()
+                        and key not in self._prediction_cache and key not in self._predicting_keys)
+            if cached is not None:
+                self.image_label.set_image(*cached)
+                if not load_mat:
+                    # 缓存命中且不需要原图数组时不再解码，直接完成显示后的处理并预读
                     self.current_frame_mat = None
-            except Exception as e:
-                print(f"照片文件夹模式：读取图片文件时出错: {e}")
-                self.current_frame_mat = None
+                    self._frame_mat_path = None
+                    self._after_frame_shown()
+                    self._prefetch_neighbors()
+                    return
+                # 预测用的数组随解码结果一起到达
+                self.update_frame_info()
+            # 当前帧优先于排队中的预读任务
+            decode_pool().start(FrameDecodeTask(self._decode_generation, frame_data, self._decode_signals,
+                                                self._decode_target_size(), load_mat), 1)
+            return
+        self._current_frame_path = None
 
         # 如果是 numpy.ndarray（视频预览模式）
-        elif isinstance(frame_data, np.ndarray):
-            # 缓存numpy数组防止GC
-            self.current_frame_mat = frame_data.copy()
-            rgb_frame = cv2.cvtColor(frame_data, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_frame.shape
-            bytes_per_line = ch * w
-            q_img = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            # 缓存QImage防止GC
-            self.current_preview_image = q_img
-            pixmap = QPixmap.fromImage(q_img)
-
-        if pixmap is None or pixmap.isNull():
+        if not isinstance(frame_data, np.ndarray):
+            return
+        # VideoCapture.read 每次返回新数组，之后不会被原地修改，直接引用无需复制
+        if not frame_data.flags["C_CONTIGUOUS"]:
+            frame_data = np.ascontiguousarray(frame_data)
+        self.current_frame_mat = frame_data
+        self._frame_mat_path = None
+        self._current_preview_index = self.frame_controller.preview_index_of(frame_data)
+        h, w = frame_data.shape[:2]
+        # 以BGR888格式直接包装OpenCV数组，省去cvtColor转换RGB
+        # QImage 只是数组的视图，QPixmap.fromImage 复制像素后即可释放，无需另外保存
+        if _HAS_BGR888:
+            image = QImage(frame_data.data, w, h, frame_data.strides[0], QImage.Format_BGR888)
+        else:
+            image = QImage(frame_data.data, w, h, frame_data.strides[0], QImage.Format_RGB888).rgbSwapped()
+        pixmap = QPixmap.fromImage(image)
+        if pixmap.isNull():
             return
 
         # 使用新的annotate_canvas设置图像
         self.image_label.set_image(pixmap)
-        self.image_label.update()
-        
+        self._after_frame_shown()
+
+    def _decode_target_size(self):
+        """解码目标尺寸：显示区域的2倍，为缩放查看留出余量"""
+        return self.image_label.size() * 2
+
+    def _apply_decoded_image(self, generation: int, frame_path: str, image: QImage,
+                             source_size, frame_mat) -> None:
+        """后台解码完成：显示图像并进行自动标注"""
+        if generation != self._decode_generation:
+            return
+        self.current_frame_mat = frame_mat
+        self._frame_mat_path = frame_path if frame_mat is not None else None
+        if image.isNull():
+            return
+
+        # 缓存未命中时才需要转换并设置图像
+        if self.pixmap_cache.lookup(frame_path) is None:
+            pixmap = QPixmap.fromImage(image)
+            self.pixmap_cache.put(frame_path, pixmap, source_size)
+            self.image_label.set_image(pixmap, source_size)
+        self._after_frame_shown()
+
+        # 当前帧处理完后再预读，顺序翻页时下一次直接命中缓存
+        QTimer.singleShot(0, self._prefetch_neighbors)
+
+    def _prefetch_neighbors(self, max_count: int = 8) -> None:
+        """
+        沿翻页方向预读后续帧，首次翻页预读3帧，同方向连续翻页时逐步加深到 max_count 帧；
+        尚未翻页或刚跳转时预读前后各一帧
+        """
+        if self._nav_direction:
+            count = min(max_count, 2 + self._nav_streak)
+            paths = self.frame_controller.get_neighbor_paths(count, self._nav_direction,
+                                                             self.interval_spinbox.value())
+        else:
+            paths = self.frame_controller.get_neighbor_paths(1)
+        if (self.function_panel.currentIndex() == 0 and self.prediction_switch.isChecked()
+                and self.auto_annotator.is_available()):
+            self._predict_ahead(paths)
+        else:
+            self.pixmap_cache.prefetch(paths, self._decode_target_size())
+
+    def _predict_ahead(self, paths: list) -> None:
+        """预读后续帧时一并解码原图数组并提交检测，相邻帧在批处理线程中合并为一次模型调用"""
+        target_size = self._decode_target_size()
+        for path in paths:
+            key = self._prediction_key_for(path)
+            if key in self._prediction_cache or key in self._predicting_keys:
+                # 已有检测结果时只需预读显示用的图像
+                self.pixmap_cache.prefetch([path], target_size)
+                continue
+            decode_pool().start(FrameDecodeTask(self._decode_generation, path, self._lookahead_signals,
+                                                target_size, load_mat=True))
+
+    def _on_lookahead_decoded(self, generation: int, frame_path: str, image: QImage,
+                              source_size, frame_mat) -> None:
+        """预读帧解码完成：放入图像缓存并提交检测"""
+        if generation != self._decode_generation:
+            return
+        if not image.isNull() and self.pixmap_cache.lookup(frame_path) is None:
+            self.pixmap_cache.put(frame_path, QPixmap.fromImage(image), source_size)
+        if frame_mat is not None and self.auto_annotator.is_available():
+            self._submit_prediction(self._prediction_key_for(frame_path), frame_mat)
+
+    def _redecode_current_frame(self) -> None:
+        """显示区域超过已解码尺寸时，按新尺寸重新解码当前帧"""
+        pixmap = self.image_label.base_pixmap
+        if not self._current_frame_path or pixmap is None or pixmap.isNull():
+            return
+        needed_width = min(self.image_label.image_width, self.image_label.width())
+        needed_height = min(self.image_label.image_height, self.image_label.height())
+        if pixmap.width() >= needed_width and pixmap.height() >= needed_height:
+            return
+        # 缓存中的帧都是按旧尺寸解码的，一并作废
+        self.pixmap_cache.clear()
+        decode_pool().start(FrameDecodeTask(self._decode_generation, self._current_frame_path,
+                                            self._refresh_signals, self._decode_target_size(),
+                                            load_mat=False))
+
+    def _apply_refreshed_image(self, generation: int, frame_path: str, image: QImage,
+                               source_size, frame_mat) -> None:
+        """重新解码完成：只替换底图，保留标注框和视图"""
+        if generation != self._decode_generation or image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        self.pixmap_cache.put(frame_path, pixmap, source_size)
+        self.image_label.replace_pixmap(pixmap)
+
+    def _after_frame_shown(self) -> None:
+        """图像显示后的公共处理：自动标注和帧信息更新"""
         # 如果在视频标注面板且当前帧不为空且预测开关开启，进行自动标注
-        if (self.function_panel.currentIndex() == 0 and self.current_frame_mat is not None 
-            and self.prediction_switch.isChecked()):
-            confidence_threshold = self.config.get("confidence_threshold", 0.5)
-            boxes = self.auto_annotator.predict(self.current_frame_mat, confidence_threshold)
-            if boxes:
-                self.image_label.load_boxes(boxes)
+        if self.function_panel.currentIndex() == 0 and self.prediction_switch.isChecked():
+            self._request_prediction()
         
         # 更新帧信息标签
         self.update_frame_info()
 
+    def _ensure_frame_mat(self):
+        """
+        取当前帧的原图BGR数组（预测和保存用）
+        文件帧只有需要预测时才在后台随显示一起解码，数组缺失或属于上一帧时在此同步读取
+        """
+        if self._current_frame_path and self._frame_mat_path != self._current_frame_path:
+            self.current_frame_mat = cv2.imread(self._current_frame_path)
+            self._frame_mat_path = self._current_frame_path if self.current_frame_mat is not None else None
+        return self.current_frame_mat
+
+    def _prediction_key_for(self, frame_id) -> tuple:
+        """帧在预测缓存中的键：(帧标识, 模型路径, 置信度阈值)"""
+        return (frame_id, self.auto_annotator.model_path, self.config.get("confidence_threshold", 0.5))
+
+    def _current_prediction_key(self) -> tuple:
+        """当前帧在预测缓存中的键"""
+        # 视频预览帧按 (视频路径, 帧号) 区分；帧号未知时用解码代次，只在切换面板时命中
+        if self._current_frame_path:
+            frame_id = self._current_frame_path
+        elif self._current_preview_index is not None:
+            frame_id = (self.config.get("video_path", ""), self._current_preview_index)
+        else:
+            frame_id = ("preview", self._decode_generation)
+        return self._prediction_key_for(frame_id)
+
+    def _request_prediction(self) -> None:
+        """提交当前帧的自动标注，已检测过的帧直接使用缓存结果"""
+        if not self.auto_annotator.is_available():
+            return
+        key = self._current_prediction_key()
+        # 同一帧来回切换面板时结果已在画布上，不重复载入（也保留用户对框的修改）
+        if key == self._shown_prediction_key:
+            return
+        self._prediction_key = key
+        boxes = self._prediction_cache.get(key)
+        if boxes is not None:
+            self._prediction_cache.move_to_end(key)
+            if boxes:
+                self.image_label.load_boxes(boxes)
+            self._shown_prediction_key = key
+            return
+        # 预读时已提交检测的帧等待结果返回即可
+        if key in self._predicting_keys:
+            return
+        frame_mat = self._ensure_frame_mat()
+        if frame_mat is None:
+            return
+        self._submit_prediction(key, frame_mat)
+
+    def _submit_prediction(self, key, frame_mat) -> None:
+        """提交一帧到批处理线程（首次使用时创建）"""
+        if self.prediction_batcher is None:
+            self.prediction_batcher = PredictionBatcher()
+            self.prediction_batcher.predictions_ready.connect(self._on_predictions_ready)
+            self.prediction_batcher.start()
+        self._predicting_keys.add(key)
+        self.prediction_batcher.submit(key, self.auto_annotator, frame_mat, self.config.get("confidence_threshold", 0.5),
+                                       self.auto_annotator.model_path)
+
+    def _on_predictions_ready(self, key, boxes: Optional[list]) -> None:
+        """批处理结果返回：按帧缓存，只有仍是当前帧时才显示；boxes 为 None 表示提交后模型已更换，不缓存"""
+        self._predicting_keys.discard(key)
+        if boxes is None:
+            return
+        self._prediction_cache[key] = boxes
+        self._prediction_cache.move_to_end(key)
+        while len(self._prediction_cache) > 256:
+            self._prediction_cache.popitem(last=False)
+        if (key == self._prediction_key and boxes and self.function_panel.currentIndex() == 0
+                and self.prediction_switch.isChecked()):
+            self.image_label.load_boxes(boxes)
+            self._shown_prediction_key = key
+
+    def _flush_config(self) -> None:
+        """在后台线程写入配置；上一次写入尚未完成时稍后再写，保证新配置最后落盘"""
+        if self._config_saver is not None and self._config_saver.isRunning():
+            self._mark_config_dirty()
+            return
+        self._config_saver = ConfigSaver(self.config)
+        self._config_saver.start()
+
+    def closeEvent(self, event) -> None:
+        """关闭窗口前写入尚未保存的配置并停止后台线程"""
+        self.frame_controller.stop_seek_worker()
+        self.frame_controller.cancel_extraction()
+        if self.prediction_batcher is not None:
+            self.prediction_batcher.stop()
+        for loader in list(self._model_loaders):
+            loader.wait()
+        if self._convert_worker is not None:
+            self._convert_worker.wait()
+        if self._save_worker is not None:
+            self._save_worker.save_finished.disconnect(self.on_save_finished)
+            self._save_worker.stop()
+        if self._config_saver is not None:
+            self._config_saver.wait()
+        if self._config_dirty_timer.isActive():
+            self._config_dirty_timer.stop()
+            Utils.save_config(self.config)
+        super().closeEvent(event)
+
     def resizeEvent(self, event) -> None:
-        if getattr(self.image_label, "auto_fit", False):
-            self.image_label.fit_to_window()
+        # 画布自身的 resizeEvent 会重新适配，这里不再重复 fit_to_window
         super().resizeEvent(event)
+        # 窗口尺寸稳定后再检查是否需要按更大尺寸重新解码
+        self._redecode_timer.start(200)
         
     def toggle_draw_mode(self, checked: bool):
         """切换绘制模式"""
-        if isinstance(self.image_label, AnnotateCanvas):
-            self.image_label.set_draw_mode(checked)
+        self._canvas_set_draw(checked)
             
     def update_frame_info(self):
         """更新帧信息标签和进度条"""
-        if hasattr(self, 'frame_info_label'):
-            try:
-                if hasattr(self.frame_controller, 'total_frames') and self.frame_controller.total_frames > 0:
-                    # 照片文件夹模式优先
-                    if hasattr(self.frame_controller, "is_image_folder_mode") and self.frame_controller.is_image_folder_mode():
-                        current = self.frame_controller.current_frame_index
-                        total = self.frame_controller.total_frames
-                        self.frame_info_label.setText(f"图片：{current} / {total}")
-                    # 预览模式
-                    else:
-                        current = self.frame_controller.current_frame_index
-                        total = self.frame_controller.total_frames
-                        self.frame_info_label.setText(f"帧：{current} / {total}")
-                    
-                    # 更新进度条
-                    if hasattr(self, 'progress_slider') and total > 0:
-                        progress = int((current / total) * 1000)  # 使用1000作为最大值
-                        # 临时禁用信号，避免循环更新
-                        self.progress_slider.blockSignals(True)
-                        self.progress_slider.setValue(progress)
-                        self.progress_slider.setMaximum(1000)
-                        self.progress_slider.blockSignals(False)
-                        
-                elif hasattr(self.frame_controller, 'frame_files'):
-                    # 文件模式
-                    if self.frame_controller.frame_files:
-                        current = self.frame_controller.current_frame_index
-                        total = len(self.frame_controller.frame_files)
-                        self.frame_info_label.setText(f"帧：{current} / {total}")
-                        
-                        # 更新进度条
-                        if hasattr(self, 'progress_slider') and total > 0:
-                            progress = int((current / total) * 1000)  # 使用1000作为最大值
-                            # 临时禁用信号，避免循环更新
-                            self.progress_slider.blockSignals(True)
-                            self.progress_slider.setValue(progress)
-                            self.progress_slider.setMaximum(1000)
-                            self.progress_slider.blockSignals(False)
-                    else:
-                        self.frame_info_label.setText("帧：- / -")
-                        if hasattr(self, 'progress_slider'):
-                            self.progress_slider.setValue(0)
-                else:
-                    self.frame_info_label.setText("帧：- / -")
-                    if hasattr(self, 'progress_slider'):
-                        self.progress_slider.setValue(0)
-            except Exception as e:
-                print(f"更新帧信息时出错: {e}")
+        try:
+            # 模式、帧号和总数都没变时不重复设置文本和进度条
+            controller = self.frame_controller
+            info_key = (controller.is_image_folder_mode(), controller.current_frame_index,
+                        controller.total_frames or len(controller.frame_files))
+            if info_key == self._last_frame_info:
+                return
+            self._last_frame_info = info_key
+
+            if controller.total_frames > 0:
+                # 照片文件夹模式优先，其次预览模式
+                current = controller.current_frame_index
+                total = controller.total_frames
+                prefix = "图片" if controller.is_image_folder_mode() else "帧"
+                self.frame_info_label.setText(f"{prefix}：{current} / {total}")
+                self._sync_progress_slider(current, total)
+            elif controller.frame_files:
+                # 文件模式
+                current = controller.current_frame_index
+                total = len(controller.frame_files)
+                self.frame_info_label.setText(f"帧：{current} / {total}")
+                self._sync_progress_slider(current, total)
+            else:
                 self.frame_info_label.setText("帧：- / -")
-                if hasattr(self, 'progress_slider'):
-                    self.progress_slider.setValue(0)
+                self._set_progress_value(0)
+        except Exception as e:
+            print(f"更新帧信息时出错: {e}")
+            self._last_frame_info = None
+            self.frame_info_label.setText("帧：- / -")
+            self._set_progress_value(0)
+
+    def _sync_progress_slider(self, current: int, total: int) -> None:
+        """按当前帧更新进度条（最大值固定为1000），拖动期间不回写位置"""
+        if total > 0 and not self.is_slider_dragging:
+            self._set_progress_value(int((current / total) * 1000))
+
+    def _set_progress_value(self, value: int) -> None:
+        """设置进度条位置，临时禁用信号，避免循环触发跳转"""
+        self.progress_slider.blockSignals(True)
+        self.progress_slider.setValue(value)
+        self.progress_slider.blockSignals(False)
                     
     def on_progress_pressed(self):
         """进度条开始拖动"""
@@ -1466,27 +1601,33 @@ class MainWindow(QMainWindow):
     def on_progress_released(self):
         """进度条拖动结束"""
         self.is_slider_dragging = False
-        # 拖动结束时才真正跳转帧
-        self._jump_to_progress_frame()
+        # 拖动时视频帧对齐到关键帧显示，松开后读取精确位置，读到后进度条随帧信息更新；
+        # 否则只把进度条对齐到实际显示的帧（拖动时跳过了进度条更新，需强制刷新）
+        self._last_frame_info = None
+        if not self._jump_to_progress_frame(self.progress_slider.value()):
+            self.update_frame_info()
         
     def on_progress_changed(self, value):
-        """进度条值改变事件处理"""
-        # 使用防抖机制，避免频繁跳转
-        if not self.is_slider_dragging:
-            # 停止之前的定时器
-            self.progress_timer.stop()
-            # 启动新的定时器，延迟100ms执行
-            self.progress_timer.start(100)
+        """
+        进度条值改变事件处理：每个值直接跳转，不经过定时器防抖
+        拖动中也实时跳转：视频帧在跳帧线程中读取，只处理最新位置；图片在线程池解码，过期结果被丢弃
+        """
+        self._jump_to_progress_frame(value)
             
-    def _jump_to_progress_frame(self):
-        """根据进度条值跳转到对应帧"""
+    def _is_current_frame(self, index: int) -> bool:
+        """目标帧是否就是当前已显示的帧"""
+        return index == self.frame_controller.current_frame_index and self.image_label.base_pixmap is not None
+
+    def _jump_to_progress_frame(self, value: int) -> bool:
+        """根据进度条值跳转到对应帧，已提交到跳帧线程异步读取时返回 True"""
         try:
-            value = self.progress_slider.value()
-            if hasattr(self.frame_controller, 'total_frames') and self.frame_controller.total_frames > 0:
+            if self.frame_controller.total_frames > 0:
                 # 照片文件夹模式优先
-                if hasattr(self.frame_controller, "is_image_folder_mode") and self.frame_controller.is_image_folder_mode():
+                if self.frame_controller.is_image_folder_mode():
                     target_frame = int((value / 1000) * self.frame_controller.total_frames)
                     target_frame = max(0, min(target_frame, self.frame_controller.total_frames - 1))
+                    if self._is_current_frame(target_frame):
+                        return False
                     # 临时禁用进度条更新，避免循环更新
                     self.progress_slider.blockSignals(True)
                     self.frame_controller.goto_image_from_folder(target_frame)
@@ -1495,24 +1636,27 @@ class MainWindow(QMainWindow):
                 else:
                     target_frame = int((value / 1000) * self.frame_controller.total_frames)
                     target_frame = max(0, min(target_frame, self.frame_controller.total_frames - 1))
-                    # 临时禁用进度条更新，避免循环更新
-                    self.progress_slider.blockSignals(True)
-                    self.frame_controller.read_frame(target_frame)
-                    self.progress_slider.blockSignals(False)
-            elif hasattr(self.frame_controller, 'frame_files') and self.frame_controller.frame_files:
+                    if self._is_current_frame(target_frame):
+                        return False
+                    # 交给跳帧线程读取，拖动时只处理最新位置并对齐到关键帧
+                    self.frame_controller.request_frame(target_frame, snap=self.is_slider_dragging)
+                    return True
+            elif self.frame_controller.frame_files:
                 # 文件模式
                 target_frame = int((value / 1000) * len(self.frame_controller.frame_files))
                 target_frame = max(0, min(target_frame, len(self.frame_controller.frame_files) - 1))
+                if self._is_current_frame(target_frame):
+                    return False
                 # 临时禁用进度条更新，避免循环更新
                 self.progress_slider.blockSignals(True)
                 self.frame_controller.load_frame(target_frame)
                 self.progress_slider.blockSignals(False)
         except Exception as e:
             print(f"进度条跳转时出错: {e}")
+        return False
             
     def keyPressEvent(self, event):
         """处理键盘事件"""
         # 将键盘事件传递给图像标注画布
-        if hasattr(self, 'image_label') and isinstance(self.image_label, AnnotateCanvas):
-            self.image_label.keyPressEvent(event)
+        self._canvas_keypress(event)
         super().keyPressEvent(event)
\ No newline at end of file
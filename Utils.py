@@ -5,11 +5,35 @@
 
 import json
 import os
+import stat
+import tempfile
+import threading
 from typing import Dict, Any, Optional
 
+import cv2
+import numpy as np
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR  # 可选依赖：直接调用 libjpeg-turbo 编码，比 cv2.imwrite 快
+except ImportError:
+    TurboJPEG = None
+
+_turbo_jpeg = None
+if TurboJPEG is not None:
+    try:
+        _turbo_jpeg = TurboJPEG()
+    except Exception as e:
+        # 找不到 libturbojpeg 动态库时退回 OpenCV
+        print(f"加载 libturbojpeg 失败，改用 OpenCV 编码: {e}")
+
 # 配置文件路径
 CONFIG_FILE = "config.json"
 
+# 最近一次读取或写入的配置文件内容，内容未变时 save_config 不再写盘
+_last_saved_text: Optional[str] = None
+# 配置读取线程、写入线程和界面线程都会调用，写文件和 _last_saved_text 的读写都需持锁
+_config_lock = threading.Lock()
+
 # 默认配置
 DEFAULT_CONFIG = {
     "video_path": "",
@@ -29,6 +53,7 @@ def load_config() -> Dict[str, Any]:
     返回:
         配置字典
     """
+    global _last_saved_text
     if not os.path.exists(CONFIG_FILE):
         # 创建默认配置
         save_config(DEFAULT_CONFIG)
@@ -36,13 +61,17 @@ def load_config() -> Dict[str, Any]:
     else:
         try:
             with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                config = json.load(f)
-                # 验证并补充缺失的配置项
-                validated_config = validate_config(config)
-                # 如果配置有变化，保存更新后的配置
-                if validated_config != config:
-                    save_config(validated_config)
-                return validated_config
+                text = f.read()
+            config = json.loads(text)
+            # 验证并补充缺失的配置项
+            validated_config = validate_config(config)
+            # 补充了缺失项时保存更新后的配置
+            if validated_config is not config:
+                save_config(validated_config)
+            else:
+                with _config_lock:
+                    _last_saved_text = _dump_config(config)
+            return validated_config
         except (json.JSONDecodeError, IOError) as e:
             print(f"配置文件读取错误: {e}，使用默认配置")
             save_config(DEFAULT_CONFIG)
@@ -56,28 +85,64 @@ def validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
     参数:
         config: 配置字典
     返回:
-        验证后的配置字典
+        验证后的配置字典，没有缺失项时直接返回 config 本身
     """
+    missing = DEFAULT_CONFIG.keys() - config.keys()
+    if not missing:
+        return config
     validated_config = DEFAULT_CONFIG.copy()
     validated_config.update(config)
     return validated_config
 
 
+def _dump_config(config: Dict[str, Any]) -> str:
+    """将配置序列化为写入文件的文本"""
+    return json.dumps(config, indent=4, ensure_ascii=False)
+
+
+def _config_file_mode() -> int:
+    """配置文件应有的权限：已存在时沿用原权限，否则为新建文件的默认权限 0666 & ~umask"""
+    try:
+        return stat.S_IMODE(os.stat(CONFIG_FILE).st_mode)
+    except OSError:
+        # umask 只能通过设置来读取，随即恢复
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
 def save_config(config: Dict[str, Any]) -> None:
     """
     保存配置文件
+    先写入同目录的临时文件再替换，写入中途出错或退出时不会留下不完整的配置文件
+    内容与最近一次读取或写入的相同且文件仍存在时不写盘；可在多个线程中调用，写入按顺序进行
     
     参数:
         config: 配置字典
     """
+    global _last_saved_text
     try:
-        # 确保配置目录存在
-        config_dir = os.path.dirname(CONFIG_FILE)
-        if config_dir and not os.path.exists(config_dir):
-            os.makedirs(config_dir, exist_ok=True)
-            
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
+        text = _dump_config(config)
+        with _config_lock:
+            if text == _last_saved_text and os.path.exists(CONFIG_FILE):
+                return
+            # 确保配置目录存在
+            config_dir = os.path.dirname(CONFIG_FILE)
+            if config_dir and not os.path.exists(config_dir):
+                os.makedirs(config_dir, exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=config_dir or ".")
+            try:
+                # 先整体序列化再一次写入，不走 json.dump 的逐块写文件
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(text)
+                # mkstemp 创建的文件权限为 0600，替换前改为原配置文件的权限（新建时按 umask 默认权限）
+                os.chmod(tmp_path, _config_file_mode())
+                os.replace(tmp_path, CONFIG_FILE)
+                _last_saved_text = text
+            except BaseException:
+                os.remove(tmp_path)
+                raise
     except IOError as e:
         print(f"配置文件保存错误: {e}")
     except Exception as e:
@@ -95,4 +160,54 @@ def get_config_value(config: Dict[str, Any], key: str, default: Any = None) -> A
     返回:
         配置值或默认值
     """
-    return config.get(key, default)
\ No newline at end of file
+    return config.get(key, default)
+
+
+def path_kind(path: str) -> Optional[str]:
+    """
+    用一次 stat 判断路径类型
+    
+    参数:
+        path: 文件或文件夹路径
+    返回:
+        "file"、"dir"，路径为空、不存在或为其他类型时返回 None
+    """
+    if not path:
+        return None
+    try:
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
+        return None
+    if stat.S_ISREG(mode):
+        return "file"
+    if stat.S_ISDIR(mode):
+        return "dir"
+    return None
+
+
+def write_jpeg(path: str, image: np.ndarray, quality: int = 95) -> bool:
+    """
+    将BGR图像保存为JPEG，安装 PyTurboJPEG 时用 libjpeg-turbo 编码后一次写入，否则使用 cv2.imwrite
+    libjpeg-turbo 编码或写入失败（如数组类型、通道数不支持）时删除写了一半的文件并改用 cv2.imwrite
+    
+    参数:
+        path: 保存路径
+        image: BGR图像数组
+        quality: JPEG质量 (1-100)
+    返回:
+        是否保存成功
+    """
+    if _turbo_jpeg is None:
+        return cv2.imwrite(path, image, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+    try:
+        data = _turbo_jpeg.encode(image, quality=int(quality), pixel_format=TJPF_BGR)
+        with open(path, "wb") as f:
+            f.write(data)
+        return True
+    except Exception as e:
+        print(f"libjpeg-turbo 编码保存出错，改用 OpenCV: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return cv2.imwrite(path, image, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
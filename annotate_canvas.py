@@ -1,9 +1,14 @@
+from collections import OrderedDict
+
 from PyQt5.QtWidgets import QLabel, QMenu, QAction
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QWheelEvent, QKeyEvent
-from PyQt5.QtCore import Qt, QRectF, QPointF
+from PyQt5.QtCore import Qt, QRectF, QPointF, QTimer
 
 
 class AnnotateCanvas(QLabel):
+    # 平滑缩放结果最多缓存的张数，回看最近几帧时无需重新缩放
+    SCALED_CACHE_SIZE = 8
+
     def __init__(self):
         super().__init__()
         # 标注框相关属性
@@ -12,9 +17,20 @@ class AnnotateCanvas(QLabel):
         self.selected_box = None
         
         # 图像相关属性
-        self.base_pixmap = None  # 原图
+        self.base_pixmap = None  # 原图（可能是按显示尺寸缩小解码的版本）
+        self.image_width = 0     # 原图逻辑宽度，标注框坐标以此为准
+        self.image_height = 0    # 原图逻辑高度
         self.auto_fit = True     # 是否在首次设置/窗口变化时自适应
         
+        # 平滑缩放缓存：(pixmap_key, 宽, 高) -> 缩放后的pixmap，按最近使用淘汰
+        self._scaled_cache = OrderedDict()
+        # 按屏幕尺寸预缩放的底图，窗口尺寸变化时从它缩放而不是从原图缩放
+        self.display_pixmap = None
+        # 窗口拖拽缩放时合并连续的resize，停止后再做一次平滑缩放
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self._do_smooth_scale)
+        
         # 缩放和平移相关属性
         self.zoom_level = 1.0
         self.offset_x = 0
@@ -38,21 +54,49 @@ class AnnotateCanvas(QLabel):
         self.resize_start_pos = None
         self.resize_start_box = None
         
-    def set_image(self, pixmap):
-        """设置底图，开启 auto_fit=True 并调用 fit_to_window()"""
+    def set_image(self, pixmap, image_size=None):
+        """设置底图，开启 auto_fit=True 并调用 fit_to_window()
+        
+        image_size 为原图尺寸（QSize），pixmap 是缩小解码的版本时传入，
+        保证标注框坐标始终在原图坐标系中
+        """
         try:
             if pixmap is None or pixmap.isNull():
                 print("警告: 尝试设置无效的图像")
                 return
                 
             self.base_pixmap = pixmap
+            # 屏幕预缩放图属于上一帧，需按新底图重新生成
+            self.display_pixmap = None
+            if image_size is not None and not image_size.isEmpty():
+                self.image_width, self.image_height = image_size.width(), image_size.height()
+            else:
+                self.image_width, self.image_height = pixmap.width(), pixmap.height()
             self.auto_fit = True
-            self.fit_to_window()
-            self.clear_boxes()
-            self.update()
+            self.boxes = []
+            self.selected_box = None
+            self.current_box = None
+            self._rescale_pixmap()
         except Exception as e:
             print(f"设置图像时出错: {e}")
         
+    def _rescale_pixmap(self):
+        """重新适配显示：自适应时重新计算缩放并安排平滑缩放，set_image 与 resizeEvent 共用"""
+        if self.auto_fit:
+            self.fit_to_window()
+        else:
+            self.update()
+        self._resize_timer.start(30)
+        
+    def replace_pixmap(self, pixmap):
+        """替换同一帧的底图（如按更大尺寸重新解码），保留标注框和当前视图"""
+        if pixmap is None or pixmap.isNull():
+            return
+        self.base_pixmap = pixmap
+        self.display_pixmap = None
+        self._resize_timer.start(30)
+        self.update()
+        
     def fit_to_window(self):
         """让图片以 95% 的比例适配当前控件尺寸"""
         if self.base_pixmap is None or self.base_pixmap.isNull():
@@ -65,9 +109,9 @@ class AnnotateCanvas(QLabel):
         if widget_width <= 0 or widget_height <= 0:
             return
             
-        # 计算图像尺寸
-        pixmap_width = self.base_pixmap.width()
-        pixmap_height = self.base_pixmap.height()
+        # 计算图像尺寸（使用原图逻辑尺寸）
+        pixmap_width = self.image_width
+        pixmap_height = self.image_height
         
         if pixmap_width <= 0 or pixmap_height <= 0:
             return
@@ -85,6 +129,53 @@ class AnnotateCanvas(QLabel):
         
         self.update()
         
+    def _scaled_size(self):
+        """当前缩放级别下底图的显示尺寸"""
+        return (int(round(self.image_width * self.zoom_level)),
+                int(round(self.image_height * self.zoom_level)))
+        
+    def _cache_key(self):
+        """平滑缩放缓存的键：(pixmap标识, 显示宽, 显示高)"""
+        return (self.base_pixmap.cacheKey(),) + self._scaled_size()
+        
+    def _screen_fit_pixmap(self):
+        """获取按屏幕尺寸预缩放的底图，每帧只生成一次"""
+        if self.display_pixmap is None:
+            self.display_pixmap = self.base_pixmap
+            screen = self.screen()
+            if screen is not None:
+                screen_size = screen.availableGeometry().size()
+                if (self.base_pixmap.width() > screen_size.width()
+                        or self.base_pixmap.height() > screen_size.height()):
+                    self.display_pixmap = self.base_pixmap.scaled(
+                        screen_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return self.display_pixmap
+        
+    def _do_smooth_scale(self):
+        """resize 停止后生成平滑缩放的底图并缓存"""
+        if self.base_pixmap is None or self.base_pixmap.isNull():
+            return
+        # 仅在自适应时使用缓存，放大查看时直接按变换绘制
+        if not self.auto_fit:
+            return
+        key = self._cache_key()
+        if key in self._scaled_cache:
+            self._scaled_cache.move_to_end(key)
+            return
+        width, height = key[1], key[2]
+        # 显示尺寸不小于底图时无需平滑缩小
+        if width <= 0 or height <= 0 or width >= self.base_pixmap.width():
+            return
+        # 显示区域不超过屏幕预缩放图时从小图缩放，否则从原图缩放
+        source = self._screen_fit_pixmap()
+        if width > source.width() or height > source.height():
+            source = self.base_pixmap
+        scaled = source.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self._scaled_cache[key] = scaled
+        while len(self._scaled_cache) > self.SCALED_CACHE_SIZE:
+            self._scaled_cache.popitem(last=False)
+        self.update()
+        
     def reset_view(self):
         """重置到自适应视图"""
         self.auto_fit = True
@@ -155,13 +246,20 @@ class AnnotateCanvas(QLabel):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
+        # 命中平滑缩放缓存时直接按显示尺寸绘制，避免每次重绘都缩放原图
+        has_pixmap = self.base_pixmap is not None and not self.base_pixmap.isNull()
+        cached = self._scaled_cache.get(self._cache_key()) if has_pixmap else None
+        if cached is not None:
+            painter.drawPixmap(QPointF(self.offset_x, self.offset_y), cached)
+        
         # 应用缩放和平移变换
         painter.translate(self.offset_x, self.offset_y)
         painter.scale(self.zoom_level, self.zoom_level)
         
-        # 绘制底图
-        if self.base_pixmap is not None and not self.base_pixmap.isNull():
-            painter.drawPixmap(0, 0, self.base_pixmap)
+        # 绘制底图（缓存未命中时使用快速变换绘制），按原图逻辑尺寸铺满
+        if has_pixmap and cached is None:
+            painter.drawPixmap(QRectF(0, 0, self.image_width, self.image_height),
+                               self.base_pixmap, QRectF(self.base_pixmap.rect()))
         
         # 绘制已存在的框
         pen = QPen(QColor(255, 0, 0), 2 / self.zoom_level)  # 红色边框，保持视觉上的一致性
@@ -218,9 +316,9 @@ class AnnotateCanvas(QLabel):
     def resizeEvent(self, event):
         """窗口大小改变事件"""
         super().resizeEvent(event)
-        # 如果 auto_fit 为 True，则调用 fit_to_window()
+        # 拖拽过程中先用快速绘制，停止30ms后再生成平滑缩放结果
         if self.auto_fit:
-            self.fit_to_window()
+            self._rescale_pixmap()
             
     def mousePressEvent(self, event):
         """鼠标按下事件"""
@@ -458,8 +556,8 @@ class AnnotateCanvas(QLabel):
             
         widget_width = self.width()
         widget_height = self.height()
-        pixmap_width = self.base_pixmap.width()
-        pixmap_height = self.base_pixmap.height()
+        pixmap_width = self.image_width
+        pixmap_height = self.image_height
         
         # 计算缩放后的图像尺寸
         scaled_width = pixmap_width * self.zoom_level
@@ -24,6 +24,7 @@ class AutoAnnotator:
         self.model_path = model_path
         self.model = None
         self.class_names = []
+        self.half = False  # 有CUDA时使用FP16推理
         
         # 如果提供了模型路径，尝试加载模型
         if model_path and os.path.exists(model_path):
@@ -43,6 +44,13 @@ class AutoAnnotator:
             self.model = YOLO(self.model_path)
             print(f"成功加载YOLO模型: {self.model_path}")
             
+            # 有CUDA时开启FP16推理，CPU上保持FP32
+            try:
+                import torch
+                self.half = torch.cuda.is_available()
+            except ImportError:
+                self.half = False
+            
             # 获取类别名称
             if hasattr(self.model, 'names'):
                 self.class_names = list(self.model.names.values())
@@ -68,15 +76,7 @@ class AutoAnnotator:
             检测结果列表，格式为 [(x1, y1, x2, y2, label), ...]
             如果模型未加载或检测失败，返回空列表
         """
-        print(f"=== AutoAnnotator.predict 开始 ===")
-        print(f"模型状态: {self.model is not None}")
-        print(f"输入帧形状: {frame.shape if frame is not None else 'None'}")
-        print(f"置信度阈值: {confidence_threshold}")
-        print(f"类别数量: {len(self.class_names)}")
-        print(f"类别名称: {self.class_names}")
-        
         if self.model is None:
-            print("模型未加载，返回空结果")
             return []
         
         if frame is None or frame.size == 0:
@@ -84,51 +84,11 @@ class AutoAnnotator:
             return []
         
         try:
-            # 使用YOLO模型进行预测
-            print("正在执行YOLO预测...")
-            results = self.model(frame)
-            print(f"YOLO预测完成，结果数量: {len(results)}")
-            
+            # 使用YOLO模型进行预测，关闭 ultralytics 每次调用的耗时日志
+            results = self.model(frame, half=self.half, verbose=False)
             boxes = []
-            for idx, result in enumerate(results):
-                print(f"处理结果 {idx}: boxes={result.boxes is not None}, boxes数量={len(result.boxes) if result.boxes is not None else 0}")
-                
-                # 获取边界框和类别信息
-                if result.boxes is not None and len(result.boxes) > 0:
-                    for i in range(len(result.boxes)):
-                        try:
-                            # 获取边界框坐标 (x1, y1, x2, y2)
-                            box = result.boxes.xyxy[i].cpu().numpy()
-                            x1, y1, x2, y2 = box
-                            
-                            # 获取类别ID和置信度
-                            cls_id = int(result.boxes.cls[i].cpu().numpy())
-                            conf = float(result.boxes.conf[i].cpu().numpy())
-                            
-                            print(f"  检测框 {i}: cls_id={cls_id}, conf={conf:.3f}, box=({x1:.1f}, {y1:.1f}, {x2:.1f}, {y2:.1f})")
-                            
-                            # 只保留置信度高于阈值的检测结果
-                            if conf >= confidence_threshold:
-                                # 获取类别名称
-                                if cls_id < len(self.class_names):
-                                    label = self.class_names[cls_id]
-                                else:
-                                    label = f"class_{cls_id}"
-                                
-                                # 添加置信度到标签中
-                                label_with_conf = f"{label} ({conf:.2f})"
-                                
-                                boxes.append((float(x1), float(y1), float(x2), float(y2), label_with_conf))
-                                print(f"  -> 添加检测框: {label_with_conf}")
-                            else:
-                                print(f"  -> 置信度不足，跳过")
-                        except Exception as box_error:
-                            print(f"处理检测框时出错: {box_error}")
-                            continue
-                else:
-                    print(f"  结果 {idx} 没有检测框")
-            
-            print(f"最终检测结果: {len(boxes)} 个目标")
+            for result in results:
+                boxes.extend(self._collect_boxes(result, confidence_threshold))
             return boxes
             
         except Exception as e:
@@ -137,6 +97,64 @@ class AutoAnnotator:
             traceback.print_exc()
             return []
     
+    def predict_batch(self, frames: List[np.ndarray], confidence_threshold: float = 0.5) -> List[List[Tuple[float, float, float, float, str]]]:
+        """
+        对多帧进行一次批量检测，分摊每次模型调用的预处理和调度开销
+        
+        参数:
+            frames: 输入图像帧列表 (numpy数组，尺寸可以不同)
+            confidence_threshold: 置信度阈值 (0.0-1.0)
+            
+        返回:
+            与 frames 一一对应的检测结果列表，模型未加载或检测失败时每帧为空列表
+        """
+        if self.model is None or not frames:
+            return [[] for _ in frames]
+        try:
+            results = self.model(list(frames), half=self.half, verbose=False)
+            return [self._collect_boxes(result, confidence_threshold) for result in results]
+        except Exception as e:
+            print(f"错误: YOLO批量预测失败: {e}")
+            return [[] for _ in frames]
+    
+    def warmup(self, frame_shape: Tuple[int, ...]) -> None:
+        """
+        用与当前视频同尺寸的空白帧预先推理一次，
+        让预测器初始化、输入缓冲区分配和CUDA内核选择在加载阶段完成，不落在首次拖动预测上
+        
+        参数:
+            frame_shape: 帧数组形状 (高, 宽, 通道)
+        """
+        if self.model is None:
+            return
+        try:
+            self.model(np.zeros(frame_shape, dtype=np.uint8), half=self.half, verbose=False)
+        except Exception as e:
+            print(f"模型预热时出错: {e}")
+    
+    def _collect_boxes(self, result, confidence_threshold: float) -> List[Tuple[float, float, float, float, str]]:
+        """从单帧检测结果中取出置信度达到阈值的标注框"""
+        boxes = []
+        if result.boxes is None or len(result.boxes) == 0:
+            return boxes
+        try:
+            # 坐标、类别和置信度各整体拷回一次，不再逐框逐字段从GPU取值
+            xyxy = result.boxes.xyxy.cpu().numpy()
+            cls_ids = result.boxes.cls.cpu().numpy().astype(np.int64)
+            confs = result.boxes.conf.cpu().numpy()
+        except Exception as box_error:
+            print(f"处理检测框时出错: {box_error}")
+            return boxes
+        
+        # 只保留置信度高于阈值的检测结果
+        keep = confs >= confidence_threshold
+        for (x1, y1, x2, y2), cls_id, conf in zip(xyxy[keep].tolist(), cls_ids[keep].tolist(),
+                                                   confs[keep].tolist()):
+            label = self.class_names[cls_id] if cls_id < len(self.class_names) else f"class_{cls_id}"
+            # 添加置信度到标签中
+            boxes.append((x1, y1, x2, y2, f"{label} ({conf:.2f})"))
+        return boxes
+    
     def is_available(self) -> bool:
         """
         检查自动标注功能是否可用
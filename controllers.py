@@ -3,12 +3,358 @@
 负责处理应用程序的业务逻辑，将UI与业务逻辑分离
 """
 
+import bisect
+import multiprocessing
 import os
-from typing import List, Optional, Any
-from PyQt5.QtCore import QObject, pyqtSignal
+import weakref
+from typing import Dict, List, Optional, Any
+from PyQt5.QtCore import QObject, QThread, QMutex, QMutexLocker, QWaitCondition, QDeadlineTimer, pyqtSignal
 import frame_splitter
 import Utils
-import cv2
+from video_reader import open_video_reader
+from auto_annotator import AutoAnnotator
+
+
+class ExtractWorker(QThread):
+    """提帧工作线程，解码和JPEG编码都在OpenCV的C++代码中执行，不阻塞界面"""
+    progress_updated = pyqtSignal(int, int)  # (已处理帧数, 总帧数)
+    extraction_finished = pyqtSignal(bool)
+
+    # 每处理多少帧发送一次进度
+    PROGRESS_STEP = 10
+
+    def __init__(self, config: dict):
+        super().__init__()
+        # 复制一份配置，提取过程中界面修改配置不影响本次任务
+        self.config = dict(config)
+        self._last_reported = -1
+        # 取消标志，多进程提取时子进程也要检查，使用 multiprocessing.Event
+        self._cancel_event = multiprocessing.Event()
+
+    def cancel(self) -> None:
+        """请求停止提取，已保存的帧保留"""
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            # 优先由 ffmpeg 一次完成解码和编码，未安装或失败时按关键帧分段多进程提取
+            success = frame_splitter.extract_frames_ffmpeg(self.config, progress_callback=self._report_progress,
+                                                           cancel_event=self._cancel_event)
+            if success is None:
+                # ffmpeg 中途失败时进度从头计算
+                self._last_reported = -1
+                success = frame_splitter.extract_frames_parallel(self.config, progress_callback=self._report_progress,
+                                                                 cancel_event=self._cancel_event)
+        except Exception as e:
+            print(f"帧提取过程中发生错误: {e}")
+            success = False
+        self.extraction_finished.emit(success)
+
+    def _report_progress(self, done: int, total: int) -> None:
+        if done - self._last_reported >= self.PROGRESS_STEP or done >= total:
+            self._last_reported = done
+            self.progress_updated.emit(done, total)
+
+
+class ConfigSaver(QThread):
+    """配置写入线程，网络盘等慢速磁盘上写配置不阻塞界面"""
+
+    def __init__(self, config: dict):
+        super().__init__()
+        # 保存调用时的快照，写入期间界面继续修改配置不受影响
+        self.config = dict(config)
+
+    def run(self):
+        Utils.save_config(self.config)
+
+
+class FrameSaveWorker(QThread):
+    """标注保存线程：JPEG编码和写文件不阻塞界面，按提交顺序依次写入"""
+    save_finished = pyqtSignal(object, str)  # (保存任务, 出错信息，成功时为空)
+
+    # 排队中的保存任务上限，磁盘过慢时拒绝新的保存而不是无限占用内存
+    MAX_PENDING = 8
+
+    def __init__(self):
+        super().__init__()
+        self._mutex = QMutex()
+        self._condition = QWaitCondition()
+        self._pending: List[dict] = []
+        self._stopping = False
+        self._created_dirs = set()  # 已创建过的输出目录，同一目录连续保存时不再重复 makedirs
+
+    def submit(self, task: dict) -> bool:
+        """
+        提交保存任务，队列已满时返回 False
+        task 包含 output_dir、image_path、frame、quality、txt_path、label_text，其余字段原样随信号返回
+        """
+        with QMutexLocker(self._mutex):
+            if len(self._pending) >= self.MAX_PENDING:
+                return False
+            self._pending.append(task)
+            self._condition.wakeOne()
+            return True
+
+    def forget_created_dirs(self) -> None:
+        """输出目录改变时清空已创建目录的记录"""
+        with QMutexLocker(self._mutex):
+            self._created_dirs.clear()
+
+    def stop(self) -> None:
+        """写完已提交的任务后结束线程并等待退出"""
+        with QMutexLocker(self._mutex):
+            self._stopping = True
+            self._condition.wakeOne()
+        self.wait()
+
+    def run(self):
+        while True:
+            self._mutex.lock()
+            while not self._pending and not self._stopping:
+                self._condition.wait(self._mutex)
+            if not self._pending:
+                self._mutex.unlock()
+                return
+            task = self._pending.pop(0)
+            need_dir = task["output_dir"] not in self._created_dirs
+            self._mutex.unlock()
+
+            error = ""
+            try:
+                if need_dir:
+                    os.makedirs(task["output_dir"], exist_ok=True)
+                    with QMutexLocker(self._mutex):
+                        self._created_dirs.add(task["output_dir"])
+                if not Utils.write_jpeg(task["image_path"], task["frame"], task["quality"]):
+                    raise IOError(f"无法写入图片 {task['image_path']}")
+                with open(task["txt_path"], "w") as f:
+                    f.write(task["label_text"])
+            except Exception as e:
+                print(f"保存标注结果时出错: {e}")
+                error = str(e)
+                # 目录可能已在外部被删除，下次保存时重新创建
+                with QMutexLocker(self._mutex):
+                    self._created_dirs.discard(task["output_dir"])
+            # 帧数组随任务一起释放，不再经信号带回界面线程
+            task["frame"] = None
+            self.save_finished.emit(task, error)
+
+
+class ConvertWorker(QThread):
+    """Labelme 转 YOLO 工作线程，转换期间界面保持响应"""
+    progress_updated = pyqtSignal(int, int)  # (已转换数, 总数)
+    conversion_finished = pyqtSignal(bool, str)  # (是否成功, 出错信息)
+
+    # 每转换多少个文件发送一次进度
+    PROGRESS_STEP = 20
+
+    def __init__(self, labelme_dir: str, save_dir: str, label_path: str, val_size: float, thread_num: int):
+        super().__init__()
+        self.labelme_dir = labelme_dir
+        self.save_dir = save_dir
+        self.label_path = label_path
+        self.val_size = val_size
+        self.thread_num = thread_num
+        self._last_reported = -1
+
+    def run(self):
+        try:
+            # 只有格式转换用到，在工作线程中按需导入
+            import label2yolo
+            success = label2yolo.convert_labelme_to_yolo(
+                labelme_dir=self.labelme_dir,
+                save_dir=self.save_dir,
+                label_path=self.label_path,
+                val_size=self.val_size,
+                thread_num=self.thread_num,
+                progress_callback=self._report_progress
+            )
+            self.conversion_finished.emit(bool(success), "")
+        except Exception as e:
+            print(f"格式转换过程中出错: {e}")
+            self.conversion_finished.emit(False, str(e))
+
+    def _report_progress(self, done: int, total: int) -> None:
+        if done - self._last_reported >= self.PROGRESS_STEP or done >= total:
+            self._last_reported = done
+            self.progress_updated.emit(done, total)
+
+
+class ConfigLoader(QThread):
+    """配置读取线程，避免启动时在界面线程上读写配置文件"""
+    config_loaded = pyqtSignal(dict)
+
+    def run(self):
+        try:
+            config = Utils.load_config()
+        except Exception as e:
+            print(f"读取配置文件时出错: {e}")
+            config = Utils.DEFAULT_CONFIG.copy()
+        self.config_loaded.emit(config)
+
+
+class KeyframeLoader(QThread):
+    """关键帧位置读取线程：解复用整个视频文件较慢，不占用跳帧线程"""
+
+    def __init__(self, controller: "FrameController"):
+        super().__init__()
+        self._controller = controller
+
+    def run(self):
+        try:
+            self._controller.load_keyframes()
+        except Exception as e:
+            print(f"读取关键帧信息时出错: {e}")
+
+
+class FrameSeekWorker(QThread):
+    """预览模式跳帧线程：只保留最新的目标帧，拖动进度条时过期的请求直接被覆盖"""
+
+    def __init__(self, controller: "FrameController"):
+        super().__init__()
+        self._controller = controller
+        self._mutex = QMutex()
+        self._condition = QWaitCondition()
+        self._pending_target: Optional[int] = None
+        self._reading_target: Optional[int] = None  # 正在读取的帧
+        self._stopping = False
+
+    def request(self, index: int, snap: bool = False) -> None:
+        """
+        提交目标帧，覆盖尚未处理的旧目标；目标正在读取时不再重复排队
+        snap 为 True 时（拖动进度条）目标对齐到之前最近的关键帧，定位后只需解码一帧；
+        关键帧位置尚未读取时在后台开始读取，读取完成前按原目标帧跳转
+        """
+        if snap and not self._controller.has_keyframes():
+            self._controller.start_keyframe_loading()
+        with QMutexLocker(self._mutex):
+            if snap:
+                index = self._controller.snap_to_keyframe(index)
+                # 对齐后的关键帧已在显示，无需重复读取
+                if index == self._controller.current_frame_index and self._reading_target is None:
+                    self._pending_target = None
+                    return
+            if index == self._reading_target:
+                self._pending_target = None
+                return
+            self._pending_target = index
+            self._condition.wakeOne()
+
+    def stop(self) -> None:
+        """结束线程并等待退出"""
+        with QMutexLocker(self._mutex):
+            self._stopping = True
+            self._condition.wakeOne()
+        self.wait()
+
+    def run(self):
+        while True:
+            self._mutex.lock()
+            while self._pending_target is None and not self._stopping:
+                self._condition.wait(self._mutex)
+            if self._stopping:
+                self._mutex.unlock()
+                return
+            target = self._pending_target
+            self._pending_target = None
+            self._reading_target = target
+            self._mutex.unlock()
+            try:
+                # frame_loaded 信号跨线程发出，由Qt排队到界面线程处理
+                self._controller.read_frame_fast(target)
+            except Exception as e:
+                print(f"跳转视频帧时出错: {e}")
+            with QMutexLocker(self._mutex):
+                self._reading_target = None
+
+
+class ModelLoader(QThread):
+    """模型加载线程：YOLO权重的反序列化和初始化不阻塞界面"""
+    model_loaded = pyqtSignal(object)  # 加载完成的 AutoAnnotator（加载失败时模型不可用）
+
+    def __init__(self, model_path: str, warmup_shape: Optional[tuple] = None):
+        super().__init__()
+        self.model_path = model_path
+        self.warmup_shape = warmup_shape  # 当前帧形状，加载后按该尺寸预热
+
+    def run(self):
+        try:
+            annotator = AutoAnnotator(self.model_path)
+            if self.warmup_shape is not None:
+                annotator.warmup(self.warmup_shape)
+        except Exception as e:
+            print(f"加载模型时出错: {e}")
+            annotator = AutoAnnotator("")
+            annotator.model_path = self.model_path
+        self.model_loaded.emit(annotator)
+
+
+class PredictionBatcher(QThread):
+    """自动标注批处理线程：把短时间内连续提交的帧合并为一次模型调用"""
+    predictions_ready = pyqtSignal(object, object)  # (帧标识, 标注框列表；提交后模型已更换时为 None)
+
+    # 收到第一帧后最多再等待多少毫秒凑批，以及单批最多帧数
+    BATCH_TIMEOUT_MS = 20
+    MAX_BATCH_SIZE = 8
+
+    def __init__(self):
+        super().__init__()
+        self._mutex = QMutex()
+        self._condition = QWaitCondition()
+        self._pending: List[tuple] = []
+        self._stopping = False
+
+    def submit(self, key: Any, annotator, frame, confidence_threshold: float, model_path: str) -> None:
+        """
+        提交一帧等待检测，结果通过 predictions_ready 按帧标识返回
+        model_path 为提交时的模型路径，检测时模型已更换则不检测并返回 None
+        """
+        with QMutexLocker(self._mutex):
+            self._pending.append((key, annotator, frame, confidence_threshold, model_path))
+            self._condition.wakeOne()
+
+    def stop(self) -> None:
+        """结束线程并等待退出"""
+        with QMutexLocker(self._mutex):
+            self._stopping = True
+            self._condition.wakeOne()
+        self.wait()
+
+    def run(self):
+        while True:
+            self._mutex.lock()
+            while not self._pending and not self._stopping:
+                self._condition.wait(self._mutex)
+            # 凑批：等到超时或攒满一批
+            deadline = QDeadlineTimer(self.BATCH_TIMEOUT_MS)
+            while (not self._stopping and len(self._pending) < self.MAX_BATCH_SIZE
+                   and not deadline.hasExpired()):
+                self._condition.wait(self._mutex, deadline)
+            if self._stopping:
+                self._mutex.unlock()
+                return
+            batch = self._pending[:self.MAX_BATCH_SIZE]
+            del self._pending[:self.MAX_BATCH_SIZE]
+            self._mutex.unlock()
+
+            # 按各帧提交时的模型和阈值分组，每组一次模型调用，结果与帧标识中的模型和阈值一致
+            groups: Dict[tuple, List[tuple]] = {}
+            for item in batch:
+                key, annotator, _, confidence_threshold, model_path = item
+                if model_path != annotator.model_path:
+                    # 提交后模型已更换，结果不属于该帧标识，直接丢弃
+                    self.predictions_ready.emit(key, None)
+                    continue
+                groups.setdefault((id(annotator), confidence_threshold), []).append(item)
+            for items in groups.values():
+                annotator, confidence_threshold = items[0][1], items[0][3]
+                try:
+                    results = annotator.predict_batch([item[2] for item in items], confidence_threshold)
+                except Exception as e:
+                    print(f"批量自动标注时出错: {e}")
+                    results = [[] for _ in items]
+                for item, boxes in zip(items, results):
+                    self.predictions_ready.emit(item[0], boxes)
 
 
 class FrameController(QObject):
@@ -16,18 +362,31 @@ class FrameController(QObject):
 
     # 定义信号
     extraction_finished = pyqtSignal(bool)  # 提取完成信号
+    extraction_progress = pyqtSignal(int, int)  # 提取进度信号（已处理帧数, 总帧数）
     frame_loaded = pyqtSignal(object)       # 帧加载完成信号（传入图片路径或numpy数组）
 
-    def __init__(self):
+    def __init__(self, config: Optional[dict] = None):
         super().__init__()
-        self.config = Utils.load_config()
+        # 与主窗口共用同一个配置字典，之后不再重新赋值
+        self.config = config if config is not None else Utils.load_config()
         self.current_frame_index = 0
         self.frame_files: List[str] = []
+        self._frame_files_dir: Optional[str] = None
+        self._extract_worker: Optional[ExtractWorker] = None
 
         # 预览模式
-        self.video_cap: Optional[cv2.VideoCapture] = None
+        self.video_reader = None  # CV2VideoReader 或 AVVideoReader
+        self.video_path: str = ""  # 预览中的视频路径
+        # 预览视频的关键帧序号，首次拖动进度条时在 KeyframeLoader 线程中读取（需要 PyAV，否则为空列表）
+        self._keyframes: Optional[List[int]] = None
+        self._keyframe_loader: Optional[KeyframeLoader] = None
         self.total_frames: int = 0
+        # 跳帧线程与界面线程共用视频读取器，读帧和打开/关闭视频都需持锁
+        self._cap_mutex = QMutex(QMutex.Recursive)
+        self._seek_worker: Optional[FrameSeekWorker] = None
         self.last_frame_mat = None  # 缓存最近一次 read_frame 发出的帧（ndarray）
+        # 已发出的预览帧 -> 帧号（按对象id索引，帧被释放时自动移除），帧排队显示时据此取回帧号
+        self._frame_indices: Dict[int, tuple] = {}
         
         # 照片文件夹模式
         self.image_folder_path: str = ""
@@ -54,16 +413,36 @@ class FrameController(QObject):
         """刷新帧文件列表（提取后浏览磁盘图片）"""
         output_dir = self.config.get("output_dir", "./output")
         self.frame_files = frame_splitter.get_frame_files(output_dir)
+        self._frame_files_dir = output_dir
+
+    def on_output_dir_changed(self, output_dir: str) -> None:
+        """输出目录变化时才重新扫描帧文件"""
+        if output_dir != self._frame_files_dir:
+            self.refresh_frame_files()
 
     def extract_frames(self) -> None:
-        """提取帧（同步调用，完成后发信号）"""
+        """在后台线程中提取帧（按关键帧分段多进程提取），过程中发进度信号，完成后发完成信号"""
+        if self.is_extracting():
+            return
         try:
-            success = frame_splitter.extract_frames(self.config)
-            self.extraction_finished.emit(success)
+            self._extract_worker = ExtractWorker(self.config)
+            self._extract_worker.progress_updated.connect(self.extraction_progress)
+            self._extract_worker.extraction_finished.connect(self.extraction_finished)
+            self._extract_worker.start()
         except Exception as e:
             print(f"帧提取过程中发生错误: {e}")
             self.extraction_finished.emit(False)
 
+    def is_extracting(self) -> bool:
+        """是否正在提取帧"""
+        return self._extract_worker is not None and self._extract_worker.isRunning()
+
+    def cancel_extraction(self) -> None:
+        """停止正在进行的提帧并等待线程结束（窗口关闭时调用）"""
+        if self.is_extracting():
+            self._extract_worker.cancel()
+            self._extract_worker.wait()
+
     def load_frame(self, index: int) -> Optional[str]:
         """从磁盘帧文件加载并发出信号"""
         if 0 <= index < len(self.frame_files):
@@ -98,29 +477,31 @@ class FrameController(QObject):
     # ----------------------------
     def open_video(self, video_path: str) -> None:
         """打开视频供预览/导航使用"""
-        if self.video_cap:
-            self.close_video()
+        with QMutexLocker(self._cap_mutex):
+            if self.video_reader:
+                self.close_video()
 
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise Exception("无法打开视频文件")
-
-        self.video_cap = cap
-        self.total_frames = int(self.video_cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 0
-        self.current_frame_index = 0
+            self.video_reader = open_video_reader(video_path)
+            self.video_path = video_path
+            self._keyframes = None
+            self.total_frames = self.video_reader.total_frames
+            self.current_frame_index = 0
 
     def close_video(self) -> None:
         """关闭视频预览"""
-        try:
-            if self.video_cap:
-                self.video_cap.release()
-                self.video_cap = None
-        except Exception as e:
-            print(f"关闭视频时出错: {e}")
-        finally:
-            self.total_frames = 0
-            self.current_frame_index = 0
-            self.last_frame_mat = None
+        with QMutexLocker(self._cap_mutex):
+            try:
+                if self.video_reader:
+                    self.video_reader.release()
+                    self.video_reader = None
+            except Exception as e:
+                print(f"关闭视频时出错: {e}")
+            finally:
+                self.video_path = ""
+                self._keyframes = None
+                self.total_frames = 0
+                self.current_frame_index = 0
+                self.last_frame_mat = None
 
     def _emit_frame_from_mat(self, mat, index: int):
         """直接发送内存图像数据（无需写入磁盘）"""
@@ -128,37 +509,109 @@ class FrameController(QObject):
             return None
         self.current_frame_index = index
         self.last_frame_mat = mat
+        key = id(mat)
+        self._frame_indices[key] = (weakref.ref(mat, lambda _, k=key: self._frame_indices.pop(k, None)), index)
         self.frame_loaded.emit(mat)  # 发出 numpy.ndarray
         return mat
 
     def read_frame(self, index: int):
-        """随机访问读取指定帧（预览模式）"""
-        if self.video_cap is None or self.total_frames <= 0:
-            return None
-        index = max(0, min(index, self.total_frames - 1))
-        self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, index)
-        ret, frame = self.video_cap.read()
-        if not ret:
+        """随机访问读取指定帧（预览模式），总是重新定位"""
+        return self._read_frame(index, seek=True)
+
+    def read_frame_fast(self, index: int):
+        """
+        读取指定帧（预览模式），向后小步跳转时顺序跳过中间帧，不重新定位
+        （定位会回到关键帧重新解码整个GOP），向前或大距离跳转时由读取器定位
+        """
+        return self._read_frame(index, seek=False)
+
+    def _read_frame(self, index: int, seek: bool):
+        with QMutexLocker(self._cap_mutex):
+            if self.video_reader is None or self.total_frames <= 0:
+                return None
+            index = max(0, min(index, self.total_frames - 1))
+            frame = self.video_reader.read(index, seek)
+            if frame is None:
+                return None
+            return self._emit_frame_from_mat(frame, index)
+
+    def preview_index_of(self, mat) -> Optional[int]:
+        """返回已发出的预览帧对应的帧号，未知时返回 None"""
+        entry = self._frame_indices.get(id(mat))
+        if entry is None or entry[0]() is not mat:
             return None
-        return self._emit_frame_from_mat(frame, index)
+        return entry[1]
+
+    def request_frame(self, index: int, snap: bool = False) -> None:
+        """
+        在跳帧线程中读取指定帧（预览模式），连续请求只处理最新的一个
+        snap 为 True 时对齐到之前最近的关键帧（拖动进度条期间使用）
+        """
+        if self._seek_worker is None:
+            self._seek_worker = FrameSeekWorker(self)
+            self._seek_worker.start()
+        self._seek_worker.request(index, snap)
+
+    def has_keyframes(self) -> bool:
+        """是否已读取过当前视频的关键帧位置"""
+        return self._keyframes is not None
+
+    def start_keyframe_loading(self) -> None:
+        """在后台线程中读取当前视频的关键帧位置，已读取或正在读取时不重复启动（界面线程调用）"""
+        if self._keyframes is not None or not self.video_path:
+            return
+        if self._keyframe_loader is not None and self._keyframe_loader.isRunning():
+            return
+        self._keyframe_loader = KeyframeLoader(self)
+        self._keyframe_loader.start()
+
+    def load_keyframes(self) -> None:
+        """读取当前视频的关键帧位置（只解复用不解码），在关键帧读取线程中调用，结果同时交给读取器"""
+        video_path = self.video_path
+        if self._keyframes is not None or not video_path:
+            return
+        keyframes = frame_splitter.get_keyframe_indices(video_path)
+        # 读取期间已切换视频时丢弃结果
+        with QMutexLocker(self._cap_mutex):
+            if video_path == self.video_path and self.video_reader is not None:
+                self._keyframes = keyframes
+                # 读取器据此判断顺序解码还是定位
+                self.video_reader.keyframes = keyframes
+
+    def snap_to_keyframe(self, index: int) -> int:
+        """返回不晚于 index 的最近关键帧，没有关键帧信息时原样返回"""
+        keyframes = self._keyframes
+        if not keyframes:
+            return index
+        pos = bisect.bisect_right(keyframes, index) - 1
+        return keyframes[pos] if pos >= 0 else index
+
+    def stop_seek_worker(self) -> None:
+        """停止跳帧线程和关键帧读取线程（窗口关闭时调用）"""
+        if self._seek_worker is not None:
+            self._seek_worker.stop()
+            self._seek_worker = None
+        if self._keyframe_loader is not None:
+            self._keyframe_loader.wait()
+            self._keyframe_loader = None
 
     def next_frame_preview(self, interval: int = 1):
         """预览模式：下一帧"""
-        if self.video_cap is None or self.total_frames <= 0:
+        if self.video_reader is None or self.total_frames <= 0:
             return None
         next_index = min(self.total_frames - 1, self.current_frame_index + interval)
-        return self.read_frame(next_index)
+        return self.read_frame_fast(next_index)
 
     def previous_frame_preview(self, interval: int = 1):
         """预览模式：上一帧"""
-        if self.video_cap is None or self.total_frames <= 0:
+        if self.video_reader is None or self.total_frames <= 0:
             return None
         prev_index = max(0, self.current_frame_index - interval)
-        return self.read_frame(prev_index)
+        return self.read_frame_fast(prev_index)
 
     def is_preview_mode(self) -> bool:
-        """是否处于视频预览模式（直接从 VideoCapture 读帧而非磁盘图片）"""
-        return self.video_cap is not None and self.total_frames > 0
+        """是否处于视频预览模式（直接从视频流读帧而非磁盘图片）"""
+        return self.video_reader is not None and self.total_frames > 0
     
     def is_image_folder_mode(self) -> bool:
         """是否处于照片文件夹模式"""
@@ -235,20 +688,38 @@ class FrameController(QObject):
         valid_index = max(0, min(max_index, target_index))
         return self.load_image_from_folder(valid_index)
 
+    def get_neighbor_paths(self, radius: int = 1, direction: int = 0, interval: int = 1) -> List[str]:
+        """
+        获取当前帧附近的图片路径（文件模式/照片文件夹模式），用于预读
+        direction 为 0 时取前后 radius 范围内的帧；为 1/-1 时按翻页步长 interval 取该方向上的后续 radius 帧
+        """
+        if self.is_image_folder_mode():
+            files = self.image_files
+        elif not self.is_preview_mode():
+            files = self.frame_files
+        else:
+            return []
+        if direction:
+            indices = [self.current_frame_index + k * direction * interval for k in range(1, radius + 1)]
+        else:
+            indices = []
+            for offset in range(1, radius + 1):
+                indices.extend((self.current_frame_index + offset, self.current_frame_index - offset))
+        return [files[index] for index in indices if 0 <= index < len(files)]
+
     def save_current_frame(self, output_dir: str, quality: int = 95, prefix: str = "frame") -> Optional[str]:
         """
         仅在预览模式下，将当前显示的帧保存到 output_dir。文件名使用当前帧号。
         返回保存后的完整路径；若失败或无帧则返回 None。
         """
         import os
-        import cv2
         try:
             if self.last_frame_mat is None:
                 return None
             os.makedirs(output_dir, exist_ok=True)
             filename = f"{prefix}_{self.current_frame_index:06d}.jpg"
             path = os.path.join(output_dir, filename)
-            success = cv2.imwrite(path, self.last_frame_mat, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+            success = Utils.write_jpeg(path, self.last_frame_mat, quality)
             if success:
                 return path
             else:
@@ -0,0 +1,238 @@
+"""
+帧缓存模块
+负责帧图像的LRU缓存、相邻帧的后台预读和后台解码
+"""
+
+import mmap
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QPixmap, QImage, QImageReader
+
+
+# 解码专用线程池：Qt的平滑缩放内部会占用全局线程池，
+# 解码任务若也放在全局线程池中，等待GIL时可能与GUI线程的缩放互相等待
+_decode_pool = QThreadPool()
+
+# Qt 5.14 起支持直接包装BGR数组
+_HAS_BGR888 = hasattr(QImage, "Format_BGR888")
+
+
+def decode_pool() -> QThreadPool:
+    """获取帧解码线程池"""
+    return _decode_pool
+
+
+def map_file(path: str) -> Optional[mmap.mmap]:
+    """以只读方式内存映射图片文件，失败（如空文件）时返回 None"""
+    try:
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def close_mapped(data: Optional[mmap.mmap]) -> None:
+    """关闭内存映射，仍有缓冲区引用时交给垃圾回收处理"""
+    if data is None:
+        return
+    try:
+        data.close()
+    except BufferError:
+        pass
+
+
+def decode_bgr(path: str, data: Optional[mmap.mmap] = None):
+    """解码为OpenCV的BGR数组，有内存映射时直接从映射的页面解码"""
+    if data is None:
+        return cv2.imread(path)
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def read_scaled_image(path: str, target_size: Optional[QSize] = None) -> Tuple[QImage, QSize]:
+    """
+    读取图片，原图大于 target_size 时由解码器直接按目标尺寸解码（JPEG可在DCT阶段缩小）
+    直接按路径读取：PyQt5 中把内存映射包装成 QByteArray 会整体复制一次，不比 QFile 读取省
+    返回 (图像, 原图尺寸)
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+    if (target_size is not None and source_size.isValid()
+            and (source_size.width() > target_size.width() or source_size.height() > target_size.height())):
+        reader.setScaledSize(source_size.scaled(target_size, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        print(f"解码图片失败: {path}, {reader.errorString()}")
+    elif not source_size.isValid():
+        source_size = image.size()
+    return image, source_size
+
+
+def image_from_bgr(frame: np.ndarray, target_size: Optional[QSize] = None) -> Tuple[QImage, QSize]:
+    """
+    由已解码的BGR数组生成显示用图像，大于 target_size 时先缩小，避免为显示再解码一次文件
+    返回 (图像, 原图尺寸)，图像持有自己的像素数据
+    """
+    h, w = frame.shape[:2]
+    source_size = QSize(w, h)
+    if target_size is not None and (w > target_size.width() or h > target_size.height()):
+        scaled = source_size.scaled(target_size, Qt.KeepAspectRatio)
+        frame = cv2.resize(frame, (max(1, scaled.width()), max(1, scaled.height())), interpolation=cv2.INTER_AREA)
+    frame = np.ascontiguousarray(frame)
+    h, w = frame.shape[:2]
+    if _HAS_BGR888:
+        # QImage 只是数组的视图，复制一份后数组可随时释放
+        image = QImage(frame.data, w, h, frame.strides[0], QImage.Format_BGR888).copy()
+    else:
+        image = QImage(frame.data, w, h, frame.strides[0], QImage.Format_RGB888).rgbSwapped()
+    return image, source_size
+
+
+class _PrefetchSignals(QObject):
+    """预读任务的信号载体（QRunnable本身不能发信号）"""
+    loaded = pyqtSignal(str, QImage, QSize)
+
+
+class _PrefetchTask(QRunnable):
+    """后台解码图片，QPixmap只能在GUI线程创建，这里只产出QImage"""
+
+    def __init__(self, path: str, signals: _PrefetchSignals, target_size: Optional[QSize] = None,
+                 pending: Optional[set] = None):
+        super().__init__()
+        self.path = path
+        self.signals = signals
+        self.target_size = target_size
+        self.pending = pending
+
+    def run(self) -> None:
+        # 排队期间已被取消的预读直接跳过
+        if self.pending is not None and self.path not in self.pending:
+            return
+        try:
+            image, source_size = read_scaled_image(self.path, self.target_size)
+            if not image.isNull():
+                self.signals.loaded.emit(self.path, image, source_size)
+        except RuntimeError:
+            # 窗口已关闭，信号对象已被销毁
+            pass
+        except Exception as e:
+            print(f"预读帧时出错: {e}")
+
+
+class FrameDecodeSignals(QObject):
+    """后台解码结果信号：(代次, 路径, 显示用QImage, 原图尺寸, 预测用BGR数组)"""
+    decoded = pyqtSignal(int, str, QImage, QSize, object)
+
+    def __init__(self):
+        super().__init__()
+        # 最新代次，由界面线程更新；排队中的旧代次任务开始前即跳过
+        self.latest_generation = 0
+
+
+class FrameDecodeTask(QRunnable):
+    """在线程池中解码当前帧，GUI线程只做QPixmap.fromImage"""
+
+    def __init__(self, generation: int, path: str, signals: FrameDecodeSignals,
+                 target_size: Optional[QSize] = None, load_mat: bool = True):
+        super().__init__()
+        self.generation = generation
+        self.path = path
+        self.signals = signals
+        self.target_size = target_size
+        self.load_mat = load_mat
+
+    def run(self) -> None:
+        # 拖动进度条时会连续提交解码，已被更新的帧取代的任务不再解码
+        if self.generation != self.signals.latest_generation:
+            return
+        image = QImage()
+        source_size = QSize()
+        frame_mat = None
+        try:
+            # 需要预测用的原图数组时只用OpenCV解码一次（从内存映射直接解码），显示图像由该数组缩小得到；
+            # 否则由 QImageReader 直接按目标尺寸解码
+            if self.load_mat:
+                data = map_file(self.path)
+                try:
+                    frame_mat = decode_bgr(self.path, data)
+                finally:
+                    close_mapped(data)
+            if frame_mat is not None:
+                image, source_size = image_from_bgr(frame_mat, self.target_size)
+            else:
+                image, source_size = read_scaled_image(self.path, self.target_size)
+        except Exception as e:
+            print(f"后台解码帧时出错: {e}")
+        try:
+            self.signals.decoded.emit(self.generation, self.path, image, source_size, frame_mat)
+        except RuntimeError:
+            # 窗口已关闭，信号对象已被销毁
+            pass
+
+
+def _pixmap_bytes(pixmap: QPixmap) -> int:
+    """估算QPixmap占用的内存字节数"""
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class FramePixmapCache:
+    """按图片路径缓存 (QPixmap, 原图尺寸)，总占用超出 max_bytes 时淘汰最久未访问的帧"""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        # 按内存而不是帧数限制容量：缓存的是按显示区域缩小后的图像，单帧大小随窗口尺寸变化
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._cache: "OrderedDict[str, Tuple[QPixmap, QSize]]" = OrderedDict()
+        self._pending = set()
+        self._signals = _PrefetchSignals()
+        self._signals.loaded.connect(self._on_prefetched)
+
+    def lookup(self, path: str) -> Optional[Tuple[QPixmap, QSize]]:
+        """仅查询缓存，不触发加载"""
+        entry = self._cache.get(path)
+        if entry is not None:
+            self._cache.move_to_end(path)
+        return entry
+
+    def put(self, path: str, pixmap: QPixmap, source_size: Optional[QSize] = None) -> None:
+        """写入缓存并按容量淘汰，至少保留刚写入的一帧"""
+        old = self._cache.pop(path, None)
+        if old is not None:
+            self._bytes -= _pixmap_bytes(old[0])
+        self._cache[path] = (pixmap, source_size if source_size is not None else pixmap.size())
+        self._bytes += _pixmap_bytes(pixmap)
+        while self._bytes > self.max_bytes and len(self._cache) > 1:
+            _, (evicted, _) = self._cache.popitem(last=False)
+            self._bytes -= _pixmap_bytes(evicted)
+
+    def prefetch(self, paths: Iterable[str], target_size: Optional[QSize] = None) -> None:
+        """在解码线程池中预读尚未缓存的帧"""
+        pool = decode_pool()
+        for path in paths:
+            if not path or path in self._cache or path in self._pending:
+                continue
+            self._pending.add(path)
+            pool.start(_PrefetchTask(path, self._signals, target_size, self._pending))
+
+    def cancel_prefetch(self) -> None:
+        """取消尚未开始的预读（翻页方向改变时调用），已在解码的结果返回后丢弃"""
+        self._pending.clear()
+
+    def clear(self) -> None:
+        """清空缓存（帧文件被重新生成或显示区域变大时调用）"""
+        self._cache.clear()
+        self._bytes = 0
+        self._pending.clear()
+
+    def _on_prefetched(self, path: str, image: QImage, source_size: QSize) -> None:
+        """预读完成，在GUI线程中转换为QPixmap"""
+        # 清空缓存后才返回的旧结果直接丢弃
+        if path not in self._pending:
+            return
+        self._pending.discard(path)
+        if path not in self._cache:
+            self.put(path, QPixmap.fromImage(image), source_size)
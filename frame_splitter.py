@@ -9,7 +9,18 @@ import argparse
 import json
 from pathlib import Path
 import glob
-from typing import Dict, List, Optional, Callable, Any
+import bisect
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Callable, Any, Tuple
+
+import Utils
+
+try:
+    import av  # 可选依赖：用于读取关键帧位置，使分段对齐到关键帧
+except ImportError:
+    av = None
 
 
 # ==============================
@@ -17,9 +28,10 @@ from typing import Dict, List, Optional, Callable, Any
 # ==============================
 def extract_frames(config: Optional[Dict[str, Any]] = None,
                    progress_callback: Optional[Callable[[int, int], None]] = None,
-                   verbose: bool = True, **kwargs) -> bool:
+                   verbose: bool = True, cancel_event: Optional[Any] = None, **kwargs) -> bool:
     """
     从视频中提取帧并保存为图片文件
+    cancel_event 为 threading.Event / multiprocessing.Event，被置位时停止提取并返回 False
     """
     try:
         # 合并配置
@@ -72,31 +84,42 @@ def extract_frames(config: Optional[Dict[str, Any]] = None,
             saved_count = 0
 
             while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    if verbose:
+                        print(f"提取已取消，已保存 {saved_count} 帧")
+                    return False
+
+                # 不保存的帧只 grab 解码，跳过转换为BGR数组
+                if frame_count % frame_interval != 0:
+                    if not cap.grab():
+                        break
+                    frame_count += 1
+                    continue
+
                 ret, frame = cap.read()
                 if not ret:
                     break
 
-                if frame_count % frame_interval == 0:
-                    filename = f"frame_{saved_count:06d}.jpg"
-                    filepath = os.path.join(output_dir, filename)
-                    
-                    # 检查图像是否有效
-                    if frame is not None and frame.size > 0:
-                        success = cv2.imwrite(filepath, frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
-                        if success:
-                            saved_count += 1
-                        else:
-                            if verbose:
-                                print(f"警告: 无法保存帧 {filename}")
-
-                    if progress_callback:
-                        progress_callback(frame_count, total_frames)
-
-                    if saved_count % 10 == 0 and verbose:
-                        print(f"已保存: {filename} (进度: {frame_count}/{total_frames} 帧)")
-
-                    if max_frames and saved_count >= max_frames:
-                        break
+                filename = f"frame_{saved_count:06d}.jpg"
+                filepath = os.path.join(output_dir, filename)
+                
+                # 检查图像是否有效
+                if frame is not None and frame.size > 0:
+                    success = Utils.write_jpeg(filepath, frame, quality)
+                    if success:
+                        saved_count += 1
+                    else:
+                        if verbose:
+                            print(f"警告: 无法保存帧 {filename}")
+
+                if progress_callback:
+                    progress_callback(frame_count, total_frames)
+
+                if saved_count % 10 == 0 and verbose:
+                    print(f"已保存: {filename} (进度: {frame_count}/{total_frames} 帧)")
+
+                if max_frames and saved_count >= max_frames:
+                    break
                 frame_count += 1
 
             if verbose:
@@ -115,6 +138,258 @@ def extract_frames(config: Optional[Dict[str, Any]] = None,
         return False
 
 
+# ==============================
+# 按关键帧分段并行提取视频帧
+# ==============================
+def get_keyframe_indices(video_path: str) -> List[int]:
+    """
+    只解复用不解码，获取视频流中关键帧的帧序号
+    未安装 PyAV 或读取失败时返回空列表
+    """
+    if av is None:
+        return []
+    try:
+        keyframes = []
+        with av.open(video_path) as container:
+            stream = container.streams.video[0]
+            index = 0
+            for packet in container.demux(stream):
+                # 末尾的空包用于冲刷解码器，不对应实际帧
+                if packet.size == 0:
+                    continue
+                if packet.is_keyframe:
+                    keyframes.append(index)
+                index += 1
+        return keyframes
+    except Exception as e:
+        print(f"读取关键帧信息时出错: {e}")
+        return []
+
+
+def split_frame_ranges(total_frames: int, parts: int, keyframes: Optional[List[int]] = None) -> List[Tuple[int, int]]:
+    """
+    将 [0, total_frames) 均分为 parts 段，有关键帧信息时每段起点向前对齐到关键帧
+    返回 [(起始帧, 结束帧), ...]，结束帧不包含
+    """
+    starts = []
+    for i in range(parts):
+        start = total_frames * i // parts
+        if keyframes:
+            pos = bisect.bisect_right(keyframes, start) - 1
+            start = keyframes[pos] if pos >= 0 else 0
+        if not starts or start > starts[-1]:
+            starts.append(start)
+    starts[0] = 0
+    ends = starts[1:] + [total_frames]
+    return [(start, end) for start, end in zip(starts, ends) if end > start]
+
+
+# 子进程中的取消标志，由进程池的 initializer 设置
+_worker_cancel_event = None
+
+
+def _init_decode_worker(cancel_event) -> None:
+    """子进程初始化：保存主进程传入的取消标志"""
+    global _worker_cancel_event
+    _worker_cancel_event = cancel_event
+
+
+def _decode_range(video_path: str, start: int, end: int, frame_interval: int,
+                  output_dir: str, quality: int) -> int:
+    """
+    子进程任务：只定位一次到 start，顺序解码到 end，按帧间隔保存
+    文件名序号按 帧号 // 帧间隔 计算，与顺序提取的编号一致
+    取消标志被置位时提前结束；定位后的位置与 start 不符时不提取，返回 -1
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return 0
+    saved_count = 0
+    try:
+        if start > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            # 按帧号定位对B帧或可变帧率视频不保证准确，位置不符时文件编号会错位
+            if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != start:
+                return -1
+        for frame_index in range(start, end):
+            if _worker_cancel_event is not None and _worker_cancel_event.is_set():
+                break
+            # 不保存的帧只 grab 解码，跳过转换为BGR数组
+            if frame_index % frame_interval != 0:
+                if not cap.grab():
+                    break
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if frame is None or frame.size == 0:
+                continue
+            filepath = os.path.join(output_dir, f"frame_{frame_index // frame_interval:06d}.jpg")
+            if Utils.write_jpeg(filepath, frame, quality):
+                saved_count += 1
+    finally:
+        cap.release()
+    return saved_count
+
+
+def extract_frames_parallel(config: Optional[Dict[str, Any]] = None,
+                            progress_callback: Optional[Callable[[int, int], None]] = None,
+                            verbose: bool = True, workers: Optional[int] = None,
+                            cancel_event: Optional[Any] = None, **kwargs) -> bool:
+    """
+    多进程提取视频帧：按关键帧把视频切成若干段，每个进程只定位一次后顺序解码
+    帧数未知、视频过短或只有一个CPU时退回顺序提取
+    cancel_event 需为 multiprocessing.Event 才能通知子进程，被置位时停止提取并返回 False
+    """
+    if config is None:
+        config = {}
+    video_path = kwargs.get('video_path', config.get('video_path', ''))
+    output_dir = kwargs.get('output_dir', config.get('output_dir', './frames'))
+    frame_interval = max(1, int(kwargs.get('frame_interval', config.get('frame_interval', 1)) or 1))
+    max_frames = kwargs.get('max_frames', config.get('max_frames', None))
+    quality = kwargs.get('quality', config.get('quality', 95))
+
+    workers = workers or os.cpu_count() or 1
+    if not video_path or not os.path.isfile(video_path) or workers <= 1:
+        return extract_frames(config, progress_callback, verbose, cancel_event, **kwargs)
+
+    try:
+        cap = cv2.VideoCapture(video_path)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+        cap.release()
+    except Exception as e:
+        if verbose:
+            print(f"读取视频信息时出错: {e}")
+        total_frames = 0
+
+    # 只需解码到最后一张要保存的帧
+    if max_frames:
+        total_frames = min(total_frames, int(max_frames) * frame_interval)
+    if total_frames < workers * 2 * frame_interval:
+        return extract_frames(config, progress_callback, verbose, cancel_event, **kwargs)
+
+    try:
+        keyframes = get_keyframe_indices(video_path)
+        if not keyframes:
+            # 没有关键帧信息时分段起点不一定是关键帧，按帧号定位可能不准，改为顺序提取
+            return extract_frames(config, progress_callback, verbose, cancel_event, **kwargs)
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        ranges = split_frame_ranges(total_frames, workers, keyframes)
+        if verbose:
+            print(f"并行提取: {len(ranges)} 段, 共 {total_frames} 帧, 帧间隔 {frame_interval}")
+
+        saved_count = 0
+        done_frames = 0
+        seek_failed = False
+        with ProcessPoolExecutor(max_workers=len(ranges), initializer=_init_decode_worker,
+                                 initargs=(cancel_event,)) as executor:
+            futures = {
+                executor.submit(_decode_range, video_path, start, end, frame_interval, output_dir, quality): (start, end)
+                for start, end in ranges
+            }
+            for future in as_completed(futures):
+                start, end = futures[future]
+                count = future.result()
+                if count < 0:
+                    seek_failed = True
+                    continue
+                saved_count += count
+                done_frames += end - start
+                if progress_callback:
+                    progress_callback(done_frames, total_frames)
+
+        if cancel_event is not None and cancel_event.is_set():
+            if verbose:
+                print(f"提取已取消，已保存 {saved_count} 帧")
+            return False
+        if seek_failed:
+            if verbose:
+                print("分段定位位置不准确，改为顺序提取")
+            return extract_frames(config, progress_callback, verbose, cancel_event, **kwargs)
+        if verbose:
+            print(f"\n完成! 共提取 {saved_count} 帧")
+            print(f"输出目录: {output_dir}")
+        return saved_count > 0
+    except Exception as e:
+        if verbose:
+            print(f"并行提取失败，改为顺序提取: {e}")
+        return extract_frames(config, progress_callback, verbose, cancel_event, **kwargs)
+
+
+# ==============================
+# 使用 ffmpeg 命令行提取视频帧
+# ==============================
+def extract_frames_ffmpeg(config: Optional[Dict[str, Any]] = None,
+                          progress_callback: Optional[Callable[[int, int], None]] = None,
+                          verbose: bool = True, cancel_event: Optional[Any] = None,
+                          **kwargs) -> Optional[bool]:
+    """
+    调用 ffmpeg 一次完成解码、抽帧和JPEG编码，文件命名与 extract_frames 一致
+    未安装 ffmpeg 时返回 None，由调用方退回 OpenCV 提取；cancel_event 被置位时结束 ffmpeg 并返回 False
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    if config is None:
+        config = {}
+    video_path = kwargs.get('video_path', config.get('video_path', ''))
+    output_dir = kwargs.get('output_dir', config.get('output_dir', './frames'))
+    frame_interval = max(1, int(kwargs.get('frame_interval', config.get('frame_interval', 1)) or 1))
+    max_frames = kwargs.get('max_frames', config.get('max_frames', None))
+    quality = kwargs.get('quality', config.get('quality', 95))
+    if not video_path or not os.path.isfile(video_path):
+        return None
+
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+    cap.release()
+    if max_frames:
+        total_frames = min(total_frames, int(max_frames) * frame_interval)
+
+    # JPEG质量 0-100 换算为 ffmpeg 的 qscale 1-31（越小质量越高）
+    qscale = max(1, min(31, int(round(31 - int(quality) * 0.3))))
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    command = [ffmpeg, "-hide_banner", "-loglevel", "error", "-nostats", "-progress", "pipe:1", "-y",
+               "-i", video_path,
+               "-vf", f"select=not(mod(n\\,{frame_interval}))", "-vsync", "0",
+               "-qmin", "1", "-qscale:v", str(qscale), "-start_number", "0"]
+    if max_frames:
+        command += ["-frames:v", str(int(max_frames))]
+    command.append(os.path.join(output_dir, "frame_%06d.jpg"))
+    if verbose:
+        print(f"使用 ffmpeg 提取: 帧间隔 {frame_interval}, qscale {qscale}")
+
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   universal_newlines=True)
+        # -progress 每隔一段时间输出 frame=已输出帧数
+        for line in process.stdout:
+            if cancel_event is not None and cancel_event.is_set():
+                process.terminate()
+                process.wait()
+                if verbose:
+                    print("提取已取消")
+                return False
+            if progress_callback and line.startswith("frame=") and total_frames:
+                saved = int(line.split("=", 1)[1].strip() or 0)
+                progress_callback(min(saved * frame_interval, total_frames), total_frames)
+        error_output = process.stderr.read()
+        if process.wait() != 0:
+            if verbose:
+                print(f"ffmpeg 提取失败: {error_output.strip()}")
+            return None
+    except (OSError, ValueError) as e:
+        if verbose:
+            print(f"调用 ffmpeg 时出错: {e}")
+        return None
+
+    if progress_callback and total_frames:
+        progress_callback(total_frames, total_frames)
+    if verbose:
+        print(f"\n完成! 输出目录: {output_dir}")
+    return True
+
+
 # ==============================
 # 从视频直接读取指定帧（不保存）
 # ==============================
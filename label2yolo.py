@@ -12,13 +12,14 @@ NAMES = []
 class Labelme2Yolo:
     """Labelme 数据集转换为 YOLO 格式的类，支持多线程"""
 
-    def __init__(self, labelme_dir, save_dir, val_size, thread_num):
+    def __init__(self, labelme_dir, save_dir, val_size, thread_num, progress_callback=None):
         self.labelme_dir = labelme_dir
         self.save_dir = save_dir if save_dir != 'default' else os.path.join(
             os.path.split(labelme_dir.rstrip('/'))[0], 'YOLODataset')
         self.labels = NAMES
         self.thread_num = thread_num
         self.train_list, self.val_list = [], []
+        self.progress_callback = progress_callback  # (已转换数, 总数)，在线程池的结果线程中调用
 
         self.make_train_val_dir()
         self.split_train_val(val_size)
@@ -123,14 +124,23 @@ class Labelme2Yolo:
     def convert(self):
         """执行多线程转换"""
         pool = ThreadPool(self.thread_num)
+        total = len(self.train_list) + len(self.val_list)
+        done = [0]
+
+        def on_done(_):
+            # 结果回调都在同一个结果线程中依次执行，计数无需加锁
+            done[0] += 1
+            if self.progress_callback:
+                self.progress_callback(done[0], total)
+
         for name in self.train_list:
             json_path = os.path.join(self.labelme_dir, f"{name}.json")
             yolo_path = os.path.join(self.train_dir_path, 'labels', f"{name}.txt")
-            pool.apply_async(self.convert_json_to_yolo, args=(json_path, yolo_path))
+            pool.apply_async(self.convert_json_to_yolo, args=(json_path, yolo_path), callback=on_done)
         for name in self.val_list:
             json_path = os.path.join(self.labelme_dir, f"{name}.json")
             yolo_path = os.path.join(self.val_dir_path, 'labels', f"{name}.txt")
-            pool.apply_async(self.convert_json_to_yolo, args=(json_path, yolo_path))
+            pool.apply_async(self.convert_json_to_yolo, args=(json_path, yolo_path), callback=on_done)
         pool.close()
         pool.join()
 
@@ -145,7 +155,7 @@ class Labelme2Yolo:
         print(f"[INFO] dataset.yaml 已生成：{yaml_path}")
 
 
-def convert_labelme_to_yolo(labelme_dir, save_dir, label_path, val_size=0.2, thread_num=8):
+def convert_labelme_to_yolo(labelme_dir, save_dir, label_path, val_size=0.2, thread_num=8, progress_callback=None):
     """
     对外封装的主函数
     :param labelme_dir: Labelme 数据集路径
@@ -153,6 +163,7 @@ def convert_labelme_to_yolo(labelme_dir, save_dir, label_path, val_size=0.2, thr
     :param label_path: 标签文件路径（内容为 Python list 格式）
     :param val_size: 验证集比例 (默认 0.2)
     :param thread_num: 线程数 (默认 8)
+    :param progress_callback: 进度回调 (已转换数, 总数)
     """
     global NAMES
     with open(label_path, 'r', encoding='utf-8') as f:
@@ -160,6 +171,6 @@ def convert_labelme_to_yolo(labelme_dir, save_dir, label_path, val_size=0.2, thr
 
     print(f"[INFO] 标签加载成功: {NAMES}")
     print(f"[INFO] 开始转换 Labelme 数据集: {labelme_dir}")
-    Labelme2Yolo(labelme_dir, save_dir, val_size, thread_num)
+    Labelme2Yolo(labelme_dir, save_dir, val_size, thread_num, progress_callback)
     print("[DONE] 数据集转换完成 ✅")
     return True;
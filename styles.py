@@ -194,4 +194,185 @@ def get_top_button_style(selected: bool = False) -> str:
             QPushButton:pressed {{
                 background-color: {COLORS["pressed"]};
             }}
-        """
\ No newline at end of file
+        """
+
+
+def get_top_button_bar_style() -> str:
+    """
+    获取顶部按钮栏样式（设置在按钮栏父控件上一次即可）
+    选中状态通过按钮的动态属性 selected 切换，无需每次切换面板都重新设置样式表
+    """
+    return f"""
+        QWidget {{
+            background-color: {COLORS["selected"]};
+            border-radius: 8px;
+            padding: 12px;
+        }}
+        QPushButton {{
+            background-color: {COLORS["primary"]};
+            border: none;
+            color: white;
+            padding: 14px 28px;
+            text-align: center;
+            text-decoration: none;
+            font-size: 25px;
+            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
+            font-weight: normal;
+            margin: 4px 2px;
+            border-radius: 8px;
+            max-width: 200px;
+            min-width: 140px;
+        }}
+        QPushButton[selected="true"] {{
+            background-color: {COLORS["selected"]};
+            border: 2px solid {COLORS["primary"]};
+        }}
+        QPushButton:hover {{
+            background-color: {COLORS["hover"]};
+        }}
+        QPushButton:pressed {{
+            background-color: {COLORS["pressed"]};
+        }}
+    """
+
+
+# 顶部按钮栏样式在导入时生成一次，选中状态由按钮的 selected 属性切换
+TOP_BUTTON_BAR_STYLE = get_top_button_bar_style()
+
+
+def get_model_status_style(color: str) -> str:
+    """获取模型状态标签样式"""
+    return f"""
+        QLabel {{ 
+            font-weight: normal; 
+            font-size: 14px;
+            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
+            color: {color};
+            margin-top: 5px;
+        }}
+    """
+
+
+# 模型状态标签样式：True 已加载，False 加载失败，None 未加载
+MODEL_STATUS_STYLES = {
+    True: get_model_status_style("#28a745"),
+    False: get_model_status_style("#dc3545"),
+    None: get_model_status_style(COLORS["secondary_text"]),
+}
+
+
+def get_prediction_switch_style() -> str:
+    """
+    获取预测开关样式，开/关两种颜色由 checked 属性选择器区分，切换时无需重新设置样式表
+    （:checked 伪状态会在圆角边缘露出关闭状态的底色，这里用属性选择器）
+    """
+    return """
+        QPushButton {
+            background-color: #dc3545;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            padding: 6px 12px;
+            font-size: 14px;
+            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
+        }
+        QPushButton:hover {
+            background-color: #c82333;
+        }
+        QPushButton[checked="true"] {
+            background-color: #28a745;
+        }
+        QPushButton[checked="true"]:hover {
+            background-color: #218838;
+        }
+    """
+
+
+def get_output_path_style(selected: bool) -> str:
+    """获取当前视频输出目录标签样式，selected 为是否已选择视频"""
+    if selected:
+        color, background, border = "#2c3e50", "#e8f5e8", "#28a745"
+    else:
+        color, background, border = "#6c757d", "#f8f9fa", "#ddd"
+    return f"""
+        QLabel {{ 
+            font-weight: normal; 
+            font-size: 14px;
+            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
+            color: {color};
+            background-color: {background};
+            border: 1px solid {border};
+            border-radius: 4px;
+            padding: 8px;
+            margin-top: 5px;
+        }}
+    """
+
+
+# 以下样式在导入时生成一次，状态切换时直接引用；样式未变时界面不再重新设置样式表
+PREDICTION_SWITCH_STYLE = get_prediction_switch_style()
+# 提取帧按钮：视频文件模式 / 照片文件夹模式（禁用）
+EXTRACT_BUTTON_STYLE = get_button_style("medium", COLORS["primary"]) + """
+    QPushButton {
+        font-size: 16px;
+        font-weight: bold;
+        min-height: 35px;
+    }
+"""
+EXTRACT_BUTTON_FOLDER_STYLE = """
+    QPushButton {
+        background-color: #6c757d;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 8px 16px;
+        font-size: 16px;
+        font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
+    }
+"""
+# 当前视频输出目录标签：True 已选择视频，False 未选择
+OUTPUT_PATH_STYLES = {
+    True: get_output_path_style(True),
+    False: get_output_path_style(False),
+}
+
+
+def get_format_conversion_panel_style() -> str:
+    """获取格式转换面板样式，整个面板共用一份样式表，子控件按类型和对象名匹配"""
+    return """
+        QGroupBox {
+            font-weight: bold;
+            font-size: 16px;
+            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
+            color: #2c3e50;
+            padding-top: 15px;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            subcontrol-position: top left;
+            padding: 5px 10px;
+        }
+        QLabel {
+            font-weight: normal;
+            font-size: 14px;
+            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
+        }
+        QLabel#convertTitle {
+            font-size: 20px;
+            font-weight: bold;
+            color: #2c3e50;
+            margin-bottom: 15px;
+        }
+        QLabel#convertProgress {
+            color: #6c757d;
+            margin-top: 10px;
+        }
+        QLineEdit, QSpinBox, QDoubleSpinBox {
+            font-size: 14px;
+            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
+            padding: 6px;
+        }
+    """
+
+
+FORMAT_CONVERSION_PANEL_STYLE = get_format_conversion_panel_style()
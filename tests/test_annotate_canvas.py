@@ -0,0 +1,47 @@
+"""
+画布平滑缩放缓存测试
+"""
+
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from annotate_canvas import AnnotateCanvas
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def _solid_pixmap(color, width=3000, height=2000):
+    """生成大于屏幕的纯色底图，缩放时会经过屏幕预缩放图"""
+    pixmap = QPixmap(width, height)
+    pixmap.fill(color)
+    return pixmap
+
+
+def _cached_color(canvas):
+    """取当前底图对应的平滑缩放结果左上角像素颜色"""
+    canvas._do_smooth_scale()
+    scaled = canvas._scaled_cache[canvas._cache_key()]
+    return scaled.toImage().pixelColor(0, 0).name()
+
+
+def test_set_image_rescales_new_frame(app):
+    canvas = AnnotateCanvas()
+    canvas.resize(300, 200)
+
+    canvas.set_image(_solid_pixmap(QColor(Qt.red)))
+    assert _cached_color(canvas) == "#ff0000"
+
+    # 切换到另一帧后，缩放结果必须来自新底图而不是上一帧的屏幕预缩放图
+    canvas.set_image(_solid_pixmap(QColor(Qt.blue)))
+    assert _cached_color(canvas) == "#0000ff"
@@ -7,7 +7,7 @@ import sys
 from typing import Tuple, Any
 from functools import partial
 
-from PyQt5.QtWidgets import QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QGroupBox, QFrame, QSpinBox, QLineEdit, QStackedWidget, QSizePolicy, QWidget, QSlider, QScrollArea
+from PyQt5.QtWidgets import QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QGroupBox, QFrame, QSpinBox, QLineEdit, QStackedWidget, QSizePolicy, QWidget, QSlider, QScrollArea, QProgressBar
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 
@@ -58,9 +58,9 @@ def create_button(text: str, color: str = styles.COLORS["primary"], size: str =
     button = QPushButton(text, parent)
     button.setCheckable(checkable)
     
-    # 设置按钮样式
+    # 设置按钮样式（顶部按钮的样式由按钮栏统一设置，这里只初始化选中属性）
     if size == "top":
-        button.setStyleSheet(styles.get_top_button_style())
+        button.setProperty("selected", False)
     else:
         button.setStyleSheet(styles.get_button_style(size, color))
 
@@ -270,7 +270,7 @@ def create_video_panel(config: dict, select_file_handler: callable,
     max_frames_spinbox = QSpinBox()
     max_frames_spinbox.setMinimum(0)
     max_frames_spinbox.setMaximum(10000)
-    max_frames_spinbox.setValue(config.get("max_frames", 0))
+    max_frames_spinbox.setValue(config.get("max_frames") or 0)
     max_frames_spinbox.setSpecialValueText("无限制")
     max_frames_spinbox.setStyleSheet("""
         QSpinBox { 
@@ -724,7 +724,7 @@ def create_video_annotate_panel(config: dict, select_file_handler: callable,
     max_frames_spinbox = QSpinBox()
     max_frames_spinbox.setMinimum(0)
     max_frames_spinbox.setMaximum(10000)
-    max_frames_spinbox.setValue(config.get("max_frames", 0))
+    max_frames_spinbox.setValue(config.get("max_frames") or 0)
     max_frames_spinbox.setSpecialValueText("无限制")
     max_frames_spinbox.setStyleSheet("""
         QSpinBox { 
@@ -752,17 +752,32 @@ def create_video_annotate_panel(config: dict, select_file_handler: callable,
     
     # 提取帧按钮 - 添加到参数组中
     extract_btn = create_button("提取帧", styles.COLORS["primary"], "medium")
-    extract_btn.setStyleSheet(styles.get_button_style("medium", styles.COLORS["primary"]) + """
-        QPushButton {
-            font-size: 16px;
-            font-weight: bold;
-            min-height: 35px;
-        }
-    """)
+    extract_btn.setStyleSheet(styles.EXTRACT_BUTTON_STYLE)
     extract_btn.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
     extract_btn.clicked.connect(extract_frames_handler)
     params_layout.addWidget(extract_btn)
     
+    # 提取进度条 - 仅在提取过程中显示
+    extract_progress_bar = QProgressBar()
+    extract_progress_bar.setMinimum(0)
+    extract_progress_bar.setMaximum(100)
+    extract_progress_bar.setValue(0)
+    extract_progress_bar.setStyleSheet("""
+        QProgressBar {
+            border: 2px solid #ddd;
+            border-radius: 5px;
+            text-align: center;
+            font-size: 14px;
+            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
+        }
+        QProgressBar::chunk {
+            background-color: #28a745;
+            border-radius: 3px;
+        }
+    """)
+    extract_progress_bar.setVisible(False)
+    params_layout.addWidget(extract_progress_bar)
+    
     params_layout.addStretch()
     layout.addWidget(params_group)
     
@@ -924,15 +939,7 @@ def create_video_annotate_panel(config: dict, select_file_handler: callable,
     
     # 模型状态显示
     model_status_label = QLabel("模型状态: 未加载")
-    model_status_label.setStyleSheet("""
-        QLabel { 
-            font-weight: normal; 
-            font-size: 14px;
-            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-            color: #6c757d;
-            margin-top: 5px;
-        }
-    """)
+    model_status_label.setStyleSheet(styles.MODEL_STATUS_STYLES[None])
     model_layout.addWidget(model_status_label)
     
     # 预测开关
@@ -948,26 +955,7 @@ def create_video_annotate_panel(config: dict, select_file_handler: callable,
     """)
     prediction_switch = QPushButton("关闭")
     prediction_switch.setCheckable(True)
-    prediction_switch.setStyleSheet("""
-        QPushButton {
-            background-color: #dc3545;
-            color: white;
-            border: none;
-            border-radius: 4px;
-            padding: 6px 12px;
-            font-size: 14px;
-            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-        }
-        QPushButton:checked {
-            background-color: #28a745;
-        }
-        QPushButton:hover {
-            background-color: #c82333;
-        }
-        QPushButton:checked:hover {
-            background-color: #218838;
-        }
-    """)
+    prediction_switch.setStyleSheet(styles.PREDICTION_SWITCH_STYLE)
     prediction_layout.addWidget(prediction_label)
     prediction_layout.addWidget(prediction_switch)
     prediction_layout.addStretch()
@@ -1133,7 +1121,7 @@ def create_video_annotate_panel(config: dict, select_file_handler: callable,
     main_panel.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
     
     # 返回主面板和相关控件
-    return main_panel, file_line_edit, video_mode_btn, folder_mode_btn, interval_spinbox, max_frames_spinbox, max_frames_set_btn, extract_btn, prev_frame_btn, next_frame_btn, frame_spinbox, goto_btn, frame_info_label, save_prediction_btn, progress_slider, new_box_btn, refresh_btn, model_path_line_edit, model_browse_btn, model_status_label, prediction_switch, confidence_slider, confidence_value_label
+    return main_panel, file_line_edit, video_mode_btn, folder_mode_btn, interval_spinbox, max_frames_spinbox, max_frames_set_btn, extract_btn, prev_frame_btn, next_frame_btn, frame_spinbox, goto_btn, frame_info_label, save_prediction_btn, progress_slider, new_box_btn, refresh_btn, model_path_line_edit, model_browse_btn, model_status_label, prediction_switch, confidence_slider, confidence_value_label, extract_progress_bar
 
 
 def create_settings_panel(config: dict) -> Tuple:
@@ -1228,19 +1216,7 @@ def create_settings_panel(config: dict) -> Tuple:
     output_layout.addWidget(current_video_label)
     
     current_video_path_label = QLabel("未选择视频")
-    current_video_path_label.setStyleSheet("""
-        QLabel { 
-            font-weight: normal; 
-            font-size: 14px;
-            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-            color: #6c757d;
-            background-color: #f8f9fa;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            padding: 8px;
-            margin-top: 5px;
-        }
-    """)
+    current_video_path_label.setStyleSheet(styles.OUTPUT_PATH_STYLES[False])
     current_video_path_label.setWordWrap(True)
     output_layout.addWidget(current_video_path_label)
     
@@ -1294,15 +1270,7 @@ def create_settings_panel(config: dict) -> Tuple:
     
     # 模型状态显示
     model_status_label = QLabel("模型状态: 未加载")
-    model_status_label.setStyleSheet("""
-        QLabel { 
-            font-weight: normal; 
-            font-size: 14px;
-            font-family: "Microsoft YaHei", "微软雅黑", sans-serif;
-            color: #6c757d;
-            margin-top: 5px;
-        }
-    """)
+    model_status_label.setStyleSheet(styles.MODEL_STATUS_STYLES[None])
     model_layout.addWidget(model_status_label)
     
     # 自动文件夹结构说明
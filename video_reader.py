@@ -0,0 +1,162 @@
+"""
+视频读取模块
+负责预览模式下按帧号读取视频帧：安装 PyAV 时按关键帧定位解码，否则使用 OpenCV
+"""
+
+import bisect
+import os
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+try:
+    import av  # 可选依赖：按关键帧定位，定位后只解码到目标帧
+except ImportError:
+    av = None
+
+
+def _needs_seek(next_index: int, index: int, limit: int, keyframes: Optional[List[int]]) -> bool:
+    """
+    判断读取 index 时是否需要定位：向前跳转或当前位置未知时定位
+    已知关键帧时，目标与当前位置之间隔着关键帧才定位（定位后从该关键帧解码更少），
+    同一GOP内无论多远都顺序解码；未知关键帧时按 limit 帧数判断
+    """
+    skip = index - next_index
+    if next_index < 0 or skip < 0:
+        return True
+    if keyframes:
+        pos = bisect.bisect_right(keyframes, index) - 1
+        return pos >= 0 and keyframes[pos] > next_index
+    return skip > limit
+
+
+class CV2VideoReader:
+    """基于 OpenCV VideoCapture 的帧读取器"""
+
+    # 向后跳转不超过该帧数时顺序 grab 跳过中间帧，超过时才定位
+    SEQUENTIAL_LIMIT = 30
+    # 解码线程数：线程越多单帧定位的延迟越大，拖动预览只用少量线程；批量抽帧仍用 OpenCV 默认值
+    DECODE_THREADS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+    def __init__(self, video_path: str):
+        self._cap = self._open_capture(video_path)
+        if not self._cap.isOpened():
+            raise Exception("无法打开视频文件")
+        self.total_frames = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 0
+        self._next_index = 0  # 下一次 read/grab 将得到的帧序号，-1 表示未知
+        self.keyframes: Optional[List[int]] = None  # 关键帧序号，由 FrameController 读取后设置
+
+    @classmethod
+    def _open_capture(cls, video_path: str) -> cv2.VideoCapture:
+        """打开视频并限制解码线程数，旧版 OpenCV 不支持打开参数时使用默认设置"""
+        if hasattr(cv2, "CAP_PROP_N_THREADS"):
+            cap = cv2.VideoCapture(video_path, cv2.CAP_ANY, [cv2.CAP_PROP_N_THREADS, cls.DECODE_THREADS])
+            if cap.isOpened():
+                return cap
+        return cv2.VideoCapture(video_path)
+
+    def read(self, index: int, seek: bool = False) -> Optional[np.ndarray]:
+        """
+        读取指定帧，向后跳转且中间没有关键帧（关键帧未知时为小步跳转）时用 grab 跳过中间帧再 read，
+        不做 CAP_PROP_POS_FRAMES 定位（定位会回到关键帧重新解码整个GOP）
+        seek 为 True 或向前/跨关键帧跳转时定位读取
+        每次返回新分配的数组，界面直接引用显示，不能改为复用缓冲区
+        """
+        if seek or _needs_seek(self._next_index, index, self.SEQUENTIAL_LIMIT, self.keyframes):
+            return self._seek_read(index)
+        for _ in range(index - self._next_index):
+            if not self._cap.grab():
+                return self._seek_read(index)
+        ret, frame = self._cap.read()
+        if not ret:
+            return self._seek_read(index)
+        self._next_index = index + 1
+        return frame
+
+    def _seek_read(self, index: int) -> Optional[np.ndarray]:
+        self._cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        ret, frame = self._cap.read()
+        if not ret:
+            self._next_index = -1
+            return None
+        self._next_index = index + 1
+        return frame
+
+    def release(self) -> None:
+        self._cap.release()
+
+
+class AVVideoReader:
+    """
+    基于 PyAV 的帧读取器：定位到目标帧之前的关键帧，只解码到目标帧
+    仅用于恒定帧率视频，帧号由时间戳换算
+    """
+
+    # 向后跳转不超过该帧数时顺序解码，超过时定位到关键帧
+    SEQUENTIAL_LIMIT = 30
+
+    def __init__(self, video_path: str):
+        self._container = av.open(video_path)
+        try:
+            self._stream = self._container.streams.video[0]
+            self._stream.thread_type = "AUTO"
+            self._fps = self._stream.average_rate
+            self._time_base = self._stream.time_base
+            # 可变帧率视频无法由时间戳换算帧号，交给 OpenCV 处理
+            if not self._fps or not self._time_base or self._stream.guessed_rate != self._fps:
+                raise ValueError("非恒定帧率视频")
+            self._start_pts = self._stream.start_time or 0
+            self.total_frames = self._stream.frames
+            if not self.total_frames and self._stream.duration:
+                self.total_frames = int(self._stream.duration * self._time_base * self._fps)
+            if not self.total_frames:
+                raise ValueError("无法获取视频帧数")
+        except Exception:
+            self._container.close()
+            raise
+        self._frames = None  # 当前解码位置的帧迭代器
+        self._next_index = 0
+        self.keyframes: Optional[List[int]] = None  # 关键帧序号，由 FrameController 读取后设置
+
+    def read(self, index: int, seek: bool = False) -> Optional[np.ndarray]:
+        """
+        读取指定帧（返回新分配的数组），向后跳转且中间没有关键帧（关键帧未知时为小步跳转）时继续顺序解码，
+        否则定位到之前的关键帧再解码到目标帧
+        """
+        if (seek or self._frames is None
+                or _needs_seek(self._next_index, index, self.SEQUENTIAL_LIMIT, self.keyframes)):
+            self._seek(index)
+        for frame in self._frames:
+            frame_index = self._index_of(frame)
+            if frame_index < index:
+                continue
+            self._next_index = frame_index + 1
+            return frame.to_ndarray(format="bgr24")
+        # 已解码到文件末尾
+        self._frames = None
+        return None
+
+    def _seek(self, index: int) -> None:
+        pts = self._start_pts + int(round(index / (self._fps * self._time_base)))
+        self._container.seek(pts, stream=self._stream, any_frame=False, backward=True)
+        self._frames = self._container.decode(self._stream)
+
+    def _index_of(self, frame) -> int:
+        if frame.pts is None:
+            return self._next_index
+        return int(round((frame.pts - self._start_pts) * self._time_base * self._fps))
+
+    def release(self) -> None:
+        self._frames = None
+        self._container.close()
+
+
+def open_video_reader(video_path: str):
+    """打开视频，优先使用 PyAV（按关键帧定位），不可用或为可变帧率时退回 OpenCV"""
+    if av is not None:
+        try:
+            return AVVideoReader(video_path)
+        except Exception as e:
+            print(f"PyAV 打开视频失败，改用 OpenCV: {e}")
+    return CV2VideoReader(video_path)